@@ -4,6 +4,7 @@ import json
 import logging
 
 import discord
+from botocore.config import Config
 intents = discord.Intents.default()
 intents.members = True
 from discord.ext import commands
@@ -29,6 +30,8 @@ from bot.verification_db import VerificationDB
 from bot.verification_cog import VerificationCog
 from bot.guild_logging_db import GuildLoggingDB
 from bot.guild_logging_cog import GuildLoggingCog
+from bot.guild_index_cog import GuildIndexCog
+from bot.async_db import DBExecutor, AsyncDB
 
 __author__ = "Richard Liang"
 
@@ -77,36 +80,55 @@ def main():
     no_command_subscription_db = NoCommandSubscriptionDB(settings["sqlite_db"])
     role_reminder_db = RoleReminderDB(settings["sqlite_db"])
 
-    # These databases are on DynamoDB.
+    # These databases are on DynamoDB.  Their calls are blocking, so they all run on a shared
+    # thread pool; make sure boto3 keeps enough connections open to serve every thread.
+    db_executor = DBExecutor(
+        max_workers=settings.get("dynamodb_max_workers", 8),
+        timeout=settings.get("dynamodb_timeout", 10),
+    )
+    boto_config = Config(max_pool_connections=db_executor.max_workers)
     raid_fyi_db = RaidFYIDB(
         table_name=settings["fyi_table"],
         endpoint_url=settings["endpoint_url"],
         region_name=settings["region_name"],
         aws_access_key_id=settings["aws_access_key_id"],
-        aws_secret_access_key=settings["aws_secret_access_key"]
+        aws_secret_access_key=settings["aws_secret_access_key"],
+        config=boto_config,
+        config_cache_ttl=settings.get("fyi_config_cache_ttl", 300),
+        ttl_attribute=settings.get("fyi_ttl_attribute"),
+        edit_history_limit=settings.get("fyi_edit_history_limit", 10)
     )
     bot_perms_db = BotPermsDB(
         table_name=settings["bot_perms_table"],
         endpoint_url=settings["endpoint_url"],
         region_name=settings["region_name"],
         aws_access_key_id=settings["aws_access_key_id"],
-        aws_secret_access_key=settings["aws_secret_access_key"]
+        aws_secret_access_key=settings["aws_secret_access_key"],
+        config=boto_config
     )
     verification_db = VerificationDB(
         table_name=settings["verification_table"],
         endpoint_url=settings["endpoint_url"],
         region_name=settings["region_name"],
         aws_access_key_id=settings["aws_access_key_id"],
-        aws_secret_access_key=settings["aws_secret_access_key"]
+        aws_secret_access_key=settings["aws_secret_access_key"],
+        config=boto_config
     )
     logging_db = GuildLoggingDB(
         table_name=settings["guild_logging_table"],
         endpoint_url=settings["endpoint_url"],
         region_name=settings["region_name"],
         aws_access_key_id=settings["aws_access_key_id"],
-        aws_secret_access_key=settings["aws_secret_access_key"]
+        aws_secret_access_key=settings["aws_secret_access_key"],
+        config=boto_config
     )
 
+    # The cogs await these databases' methods rather than calling them directly.
+    raid_fyi_db = AsyncDB(raid_fyi_db, db_executor)
+    bot_perms_db = AsyncDB(bot_perms_db, db_executor)
+    verification_db = AsyncDB(verification_db, db_executor)
+    logging_db = AsyncDB(logging_db, db_executor)
+
     # These have been converted to check bot perms under the new scheme.
     logging_cog = GuildLoggingCog(gvrd_grunt, logging_db, bot_perms_db)
     gvrd_grunt.add_cog(logging_cog)
@@ -125,6 +147,15 @@ def main():
             settings.get("friend_code_cleanup_get_fc_delay"),
             settings.get("friend_code_suppress_code_reaction"),
             logging_cog=logging_cog,
+            fyi_refresh_delay=settings.get("fyi_refresh_delay", 2),
+            friend_code_cache_ttl=settings.get("friend_code_cache_ttl", 600),
+            clean_up_concurrency=settings.get("fyi_clean_up_concurrency", 4),
+            clean_up_guild_timeout=settings.get("fyi_clean_up_guild_timeout", 300),
+            schedule_expiry=settings.get("fyi_schedule_expiry", False),
+            fyi_post_concurrency=settings.get("fyi_post_concurrency", 4),
+            message_cache_size=settings.get("fyi_message_cache_size", 1000),
+            message_cache_ttl=settings.get("fyi_message_cache_ttl", 3600),
+            relay_edit_interval=settings.get("fyi_relay_edit_interval", 1),
         )
     )
     gvrd_grunt.add_cog(VerificationCog(gvrd_grunt, verification_db, bot_perms_db))
@@ -137,6 +168,7 @@ def main():
     gvrd_grunt.add_cog(RoleSetOperationsCog(gvrd_grunt))
     gvrd_grunt.add_cog(PurgeChannelsCog(gvrd_grunt))
     gvrd_grunt.add_cog(RoleReminderCog(gvrd_grunt, role_reminder_db, logging_cog=logging_cog))
+    gvrd_grunt.add_cog(GuildIndexCog(gvrd_grunt))
 
 
     # For testing only -- *do not install on a production bot!*
@@ -169,7 +201,10 @@ def main():
     logging.getLogger("discord").setLevel(logging.WARNING)
     logging.getLogger("websockets.protocol").setLevel(logging.INFO)
 
-    gvrd_grunt.run(settings["token"], bot=True)
+    try:
+        gvrd_grunt.run(settings["token"], bot=True)
+    finally:
+        db_executor.shutdown()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,105 @@
+"""
+Helpers that run our blocking (boto3) database calls off the event loop.
+
+A single DBExecutor is shared by all of the DynamoDB-backed databases; each database is wrapped in
+an AsyncDB, whose methods are coroutines that the cogs await.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+
+def nonblocking(method):
+    """
+    Mark a database method as not performing any I/O, so that AsyncDB calls it directly instead of on the pool.
+
+    :param method:
+    :return:
+    """
+    method.nonblocking = True
+    return method
+
+
+class DBExecutor(object):
+    """
+    A bounded thread pool that runs blocking database calls with a per-call timeout.
+    """
+    def __init__(self, max_workers=8, timeout=10):
+        """
+        :param max_workers: the maximum number of database calls that may be in flight at once
+        :param timeout: the number of seconds to wait for a call before raising asyncio.TimeoutError
+        (None to wait indefinitely)
+        """
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db")
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+    async def run(self, func, *args, timeout=None, **kwargs):
+        """
+        Run func(*args, **kwargs) on the thread pool and wait for the result.
+
+        :param func:
+        :param timeout: overrides the executor's default timeout for this call
+        :return:
+        """
+        loop = asyncio.get_event_loop()
+        future = loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+        return await asyncio.wait_for(future, timeout if timeout is not None else self.timeout)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+
+
+class AsyncDB(object):
+    """
+    Wraps a synchronous database object (e.g. a RaidFYIDB) so that its methods are awaitable.
+
+    Calling a method of the wrapped object returns a coroutine that runs the method on the DBExecutor;
+    non-callable attributes (e.g. class constants) and methods marked with @nonblocking are passed through
+    unchanged.
+    """
+    def __init__(self, db, executor: DBExecutor, timeout=None):
+        """
+        :param db: the synchronous database object to wrap
+        :param executor: the DBExecutor to run calls on
+        :param timeout: overrides the executor's default timeout for calls to this database
+        """
+        self.sync_db = db
+        self.executor = executor
+        self.timeout = timeout
+
+    async def iterate_pages(self, name, *args, **kwargs):
+        """
+        Asynchronously iterate over the results of a paged method of the wrapped object.
+
+        The method must accept an exclusive_start_key keyword argument and return a pair
+        (list of results, key of the next page or None); each page is read on the DBExecutor only when
+        the previous one has been consumed.
+
+        :param name: the name of the paged method, e.g. "get_expired_fyis_page"
+        :return:
+        """
+        page_method = getattr(self.sync_db, name)
+        next_key = None
+        while True:
+            page, next_key = await self.executor.run(
+                page_method,
+                *args,
+                exclusive_start_key=next_key,
+                timeout=self.timeout,
+                **kwargs
+            )
+            for result in page:
+                yield result
+            if next_key is None:
+                return
+
+    def __getattr__(self, name):
+        attr = getattr(self.sync_db, name)
+        if not callable(attr) or isinstance(attr, type) or getattr(attr, "nonblocking", False):
+            return attr
+
+        @functools.wraps(attr)
+        async def wrapper(*args, **kwargs):
+            return await self.executor.run(attr, *args, timeout=self.timeout, **kwargs)
+        return wrapper
@@ -16,9 +16,9 @@ class BotPermsChecker(object):
     """
     def __init__(self, bot, permissions_db):
         self.bot = bot
-        self.permissions_db = permissions_db  # a BotPermsDB or workalike
+        self.permissions_db = permissions_db  # an AsyncDB wrapping a BotPermsDB, or workalike
 
-    def can_configure_bot(self, ctx):
+    async def can_configure_bot(self, ctx):
         """
         True if the calling member has bot perms for this guild; False otherwise.
 
@@ -30,14 +30,14 @@ class BotPermsChecker(object):
             return True
 
         try:
-            result = self.permissions_db.get_bot_perms(ctx.guild)
+            result = await self.permissions_db.get_bot_perms(ctx.guild)
         except GuildPermsNotConfigured:
             return False
 
         return len(set(ctx.author.roles).intersection(result["can_configure_bot"])) > 0
 
-    def can_configure_bot_validator(self, ctx):
-        if not self.can_configure_bot(ctx):
+    async def can_configure_bot_validator(self, ctx):
+        if not await self.can_configure_bot(ctx):
             raise CannotRunCommand("You do not have permissions to run this command.")
 
 
@@ -56,11 +56,11 @@ class BotPermsCog(BotPermsChecker, Cog):
         :param ctx:
         :return:
         """
-        self.can_configure_bot_validator(ctx)
+        await self.can_configure_bot_validator(ctx)
 
         perms_str = "(None)"
         try:
-            bot_perms = self.permissions_db.get_bot_perms(ctx.guild)
+            bot_perms = await self.permissions_db.get_bot_perms(ctx.guild)
             if bot_perms is not None and len(bot_perms["can_configure_bot"]) > 0:
                 perms_str = "- " + "\n- ".join([str(x) for x in bot_perms["can_configure_bot"]])
         except GuildPermsNotConfigured:
@@ -86,7 +86,7 @@ class BotPermsCog(BotPermsChecker, Cog):
         :param role:
         :return:
         """
-        self.permissions_db.add_bot_permissions_to_role(ctx.guild, role)
+        await self.permissions_db.add_bot_permissions_to_role(ctx.guild, role)
         summary_message = f"{ctx.author.mention} Members with role {role} can now configure the bot."
         await ctx.channel.send(summary_message)
 
@@ -107,7 +107,7 @@ class BotPermsCog(BotPermsChecker, Cog):
         :param role:
         :return:
         """
-        self.permissions_db.remove_bot_permissions_from_role(ctx.guild, role)
+        await self.permissions_db.remove_bot_permissions_from_role(ctx.guild, role)
         summary_message = f"{ctx.author.mention} Members with role {role} cannot configure the bot."
         await ctx.channel.send(summary_message)
 
@@ -126,7 +126,7 @@ class BotPermsCog(BotPermsChecker, Cog):
         :param ctx:
         :return:
         """
-        self.permissions_db.reset_bot_permissions(ctx.guild)
+        await self.permissions_db.reset_bot_permissions(ctx.guild)
         summary_message = f"{ctx.author.mention} All roles have had their bot configuration privileges revoked."
         await ctx.channel.send(summary_message)
 
@@ -1,7 +1,65 @@
 """
 Simple helper functions that convert object IDs to the corresponding Discord objects using only the guild.
+
+Lookups go through a per-guild index of the guild's roles and emoji, which is built the first time it's needed;
+GuildIndexCog drops a guild's index whenever its roles or emoji change, or the guild's state is reloaded from the
+gateway, so that it's rebuilt on the next lookup.  An index is also rebuilt if it was built from a different Guild
+object than the one it's looked up with (discord.py replaces its Guild objects when it re-identifies).
 """
 
+
+class GuildIndex(object):
+    """
+    Dictionaries of a guild's roles and emoji, built from a snapshot of the guild.
+    """
+    def __init__(self, guild):
+        self.guild = guild  # the Guild object this index was built from
+        self.roles_by_id = {}  # maps role ID -|-> role
+        self.roles_by_name = {}  # maps role name -|-> first role (in guild.roles order) with that name
+        self.roles_by_lower_name = {}  # maps lower-cased role name -|-> list of roles, in guild.roles order
+        for role in guild.roles:
+            self.roles_by_id[role.id] = role
+            self.roles_by_name.setdefault(role.name, role)
+            self.roles_by_lower_name.setdefault(role.name.lower(), []).append(role)
+        self.emojis_by_id = {emoji.id: emoji for emoji in guild.emojis}  # maps emoji ID -|-> emoji
+
+
+guild_indices = {}  # maps guild ID -|-> GuildIndex
+
+
+def get_guild_index(guild):
+    """
+    Return the guild's index, building it if necessary.
+
+    :param guild:
+    :return:
+    """
+    index = guild_indices.get(guild.id)
+    if index is None or index.guild is not guild:
+        index = GuildIndex(guild)
+        guild_indices[guild.id] = index
+    return index
+
+
+def invalidate_guild_index(guild):
+    """
+    Drop the guild's index (e.g. because its roles or emoji have changed) so that it's rebuilt on the next lookup.
+
+    :param guild:
+    :return:
+    """
+    guild_indices.pop(guild.id, None)
+
+
+def invalidate_all_guild_indices():
+    """
+    Drop every guild's index (e.g. because the bot has reconnected and its view of all guilds was reloaded).
+
+    :return:
+    """
+    guild_indices.clear()
+
+
 def role_converter(guild, role_id):
     """
     Find the guild role corresponding to the given role ID.
@@ -10,9 +68,7 @@ def role_converter(guild, role_id):
     :param role_id:
     :return:
     """
-    for role in guild.roles:
-        if role.id == role_id:
-            return role
+    return get_guild_index(guild).roles_by_id.get(role_id)
 
 
 def role_converter_from_name(guild, role_name):
@@ -23,9 +79,7 @@ def role_converter_from_name(guild, role_name):
     :param role_id:
     :return:
     """
-    for role in guild.roles:
-        if role.name == role_name:
-            return role
+    return get_guild_index(guild).roles_by_name.get(role_name)
 
 
 def get_matching_roles_case_insensitive(guild, role_name):
@@ -41,19 +95,15 @@ def get_matching_roles_case_insensitive(guild, role_name):
     :param role_name:
     :return: a list of all possible matching roles.
     """
-    possible_roles = []
-    for role in guild.roles:
-        if role.name == role_name:
-            return [role]
-        if role.name.lower() == role_name.lower():
-            possible_roles.append(role)
+    index = get_guild_index(guild)
+    if role_name in index.roles_by_name:
+        return [index.roles_by_name[role_name]]
+    possible_roles = list(index.roles_by_lower_name.get(role_name.lower(), []))
 
-    if len(possible_roles) == 0 and role_name[0] == "@":
-        for role in guild.roles:
-            if role_name[1:] == role.name:
-                return [role]
-            if role_name[1:].lower() == role.name.lower():
-                possible_roles.append(role)
+    if len(possible_roles) == 0 and role_name.startswith("@"):
+        if role_name[1:] in index.roles_by_name:
+            return [index.roles_by_name[role_name[1:]]]
+        possible_roles = list(index.roles_by_lower_name.get(role_name[1:].lower(), []))
 
     return possible_roles
 
@@ -66,6 +116,4 @@ def emoji_converter(guild, emoji_id):
     :param emoji_id:
     :return:
     """
-    for emoji in guild.emojis:
-        if emoji.id == emoji_id:
-            return emoji
+    return get_guild_index(guild).emojis_by_id.get(emoji_id)
@@ -195,6 +195,8 @@ class EXGateCog(Cog):
         :return:
         """
         guild = self.bot.get_guild(payload.guild_id)
+        if guild is None:
+            return
         ex_gate_info = self.db.get_ex_gate_info(guild)
         # Do nothing if the guild doesn't have EX gating active.
         if ex_gate_info is None:
@@ -266,7 +268,7 @@ class EXGateCog(Cog):
             return
 
         # Do nothing if the message is not in the disclaimer channel.
-        if message.channel != ex_gate_info["disclaimer_channel"]:
+        if message.channel.id != ex_gate_info["disclaimer_channel_id"]:
             return
 
         # Do nothing if the message is from the bot itself.
@@ -274,7 +276,7 @@ class EXGateCog(Cog):
             return
 
         # Having reached here, we're confident the message is from a proper member of the guild.
-        if message.content.lower() in ex_gate_info["accepted_messages"]:
+        if message.content.lower() in ex_gate_info["accepted_message_set"]:
             await self.assign_ex_role(message.author)
             reply = await message.channel.send(
                 ex_gate_info["approval_message_template"].format(message.author.mention)
@@ -292,3 +294,39 @@ class EXGateCog(Cog):
         await asyncio.sleep(ex_gate_info["wait_time"])
         await message.delete()
         await reply.delete()
+
+    @Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        """
+        Drop the guild's cached EX gating configuration, as the deleted role may be the EX role.
+
+        :param role:
+        :return:
+        """
+        self.db.invalidate_ex_gate_info(role.guild)
+
+    @Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        """
+        Drop the guild's cached EX gating configuration, as the deleted channel may be the disclaimer channel.
+
+        :param channel:
+        :return:
+        """
+        self.db.invalidate_ex_gate_info(channel.guild)
+
+    @Cog.listener()
+    async def on_guild_emojis_update(self, guild: discord.Guild, before, after):
+        """
+        Drop the guild's cached EX gating configuration, as the approve emoji may have changed.
+
+        :param guild:
+        :param before:
+        :param after:
+        :return:
+        """
+        self.db.invalidate_ex_gate_info(guild)
+
+    @Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.db.invalidate_ex_gate_info(guild)
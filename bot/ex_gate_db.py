@@ -7,17 +7,44 @@ from bot.convert_using_guild import emoji_converter, role_converter
 class EXGateDB(object):
     """
     A class representing the SQLite database we use to store our information.
+
+    Each guild's EX gating configuration is cached, already resolved, the first time it's read; the methods of
+    this class that change a guild's configuration drop its entry, as should anything that might leave a
+    resolved object stale (e.g. the deletion of the EX role).
     """
     def __init__(self, path_to_db):
         self.path_to_db = path_to_db
         self.conn = sqlite3.connect(self.path_to_db)  # database can be initialized with ex_gate_initialization.sql
+        self.ex_gate_cache = {}  # maps guild ID -|-> resolved configuration, or None if the guild has none
+
+    def invalidate_ex_gate_info(self, guild: discord.Guild):
+        """
+        Drop this guild's cached configuration so that it's read afresh next time.
+
+        :param guild:
+        :return:
+        """
+        self.ex_gate_cache.pop(guild.id, None)
 
     def get_ex_gate_info(self, guild: discord.Guild):
         """
-        Return some raw guild information required for the EX gating.
+        Return the guild information required for the EX gating.
+
+        Besides the resolved configuration, the result holds the disclaimer channel's ID and a set of the
+        accepted messages (exactly as stored), so that events can be checked against it cheaply.  It is shared
+        between callers and must not be modified.
+
+        :param guild:
+        :return:
+        """
+        if guild.id not in self.ex_gate_cache:
+            self.ex_gate_cache[guild.id] = self.read_ex_gate_info(guild)
+        return self.ex_gate_cache[guild.id]
+
+    def read_ex_gate_info(self, guild: discord.Guild):
+        """
+        Read this guild's EX gating configuration from the database, bypassing the cache.
 
-        Because we don't have a context object, we can't convert channel IDs to channels
-        or role IDs to roles.
         :param guild:
         :return:
         """
@@ -30,7 +57,8 @@ class EXGateDB(object):
                     approve_emoji, 
                     ex_role_id, 
                     wait_time, 
-                    approval_message_template
+                    approval_message_template,
+                    approve_emoji_type
                 from ex_gate 
                 where guild_id = ?;
                 """,
@@ -39,6 +67,7 @@ class EXGateDB(object):
             guild_info_tuple = guild_info_cursor.fetchone()
         if guild_info_tuple is None:
             return None
+        approve_emoji_type = guild_info_tuple[-1]
 
         result = dict(
             zip(
@@ -50,21 +79,12 @@ class EXGateDB(object):
                     "wait_time",
                     "approval_message_template"
                 ],
-                guild_info_tuple
+                guild_info_tuple[:-1]
             )
         )
+        result["disclaimer_channel_id"] = result["disclaimer_channel"]
 
         # Convert the approve emoji to the appropriate type if it's a custom emoji.
-        with self.conn:
-            guild_info_cursor = self.conn.execute(
-                """
-                select approve_emoji_type
-                from ex_gate 
-                where guild_id = ?;
-                """,
-                (guild.id,)
-            )
-            approve_emoji_type = guild_info_cursor.fetchone()[0]
         if approve_emoji_type == "custom":
             result["approve_emoji"] = emoji_converter(guild, result["approve_emoji"])
 
@@ -84,6 +104,7 @@ class EXGateDB(object):
                 (guild.id,)
             )
         result["accepted_messages"] = [accepted_message[0] for accepted_message in guild_info_cursor]
+        result["accepted_message_set"] = frozenset(result["accepted_messages"])
 
         return result
 
@@ -136,6 +157,7 @@ class EXGateDB(object):
                     approval_message_template
                 )
             )
+        self.invalidate_ex_gate_info(guild)
 
     def add_accepted_message(self, guild: discord.Guild, accepted_message):
         """
@@ -155,6 +177,7 @@ class EXGateDB(object):
                     accepted_message
                 )
             )
+        self.invalidate_ex_gate_info(guild)
 
     def clear_accepted_messages(self, guild: discord.Guild):
         """
@@ -168,6 +191,7 @@ class EXGateDB(object):
                 "delete from ex_gate_accepted_message where guild_id = ?;",
                 (guild.id,)
             )
+        self.invalidate_ex_gate_info(guild)
 
     def remove_ex_gate_data(self, guild: discord.Guild):
         """
@@ -182,4 +206,5 @@ class EXGateDB(object):
                 "delete from ex_gate where guild_id = ?;",
                 (guild.id,)
             )
+        self.invalidate_ex_gate_info(guild)
 
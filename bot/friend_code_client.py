@@ -0,0 +1,132 @@
+import asyncio
+import json
+import time
+
+import aiohttp
+
+
+class FriendCodeClient(object):
+    """
+    An asynchronous client for the friend code server, with a per-user cache of lookups.
+
+    Both found and missing (404) friend codes are cached for cache_ttl seconds; setting or unsetting a
+    user's friend code through this client invalidates that user's entry.
+    """
+    def __init__(self, url_template, x_api_key, cache_ttl=600, max_connections=10, timeout=5):
+        """
+        :param url_template: a template string that produces a user's URL when formatted with their ID
+        :param x_api_key: authentication key for the friend code server
+        :param cache_ttl: the number of seconds to remember a lookup for
+        :param max_connections: the maximum number of simultaneous connections to the server
+        :param timeout: the number of seconds to wait for a request before giving up
+        """
+        self.url_template = url_template
+        self.headers = {
+            "x-api-key": x_api_key,
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        }
+        self.cache_ttl = cache_ttl
+        self.max_connections = max_connections
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.session = None
+        self.cache = {}  # maps user ID -|-> (time cached, friend code or None)
+
+    def get_session(self):
+        """
+        Return the client's session, creating it if necessary (this must be done inside the event loop).
+
+        :return:
+        """
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                headers=self.headers,
+                timeout=self.timeout,
+            )
+        return self.session
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+
+    def invalidate(self, user_id):
+        """
+        Forget any cached lookup for this user.
+
+        :param user_id:
+        :return:
+        """
+        self.cache.pop(user_id, None)
+
+    async def get_friend_code(self, user_id):
+        """
+        Look up this user's friend code.
+
+        :param user_id:
+        :return: the friend code, or None if the user has none (or the server could not be reached)
+        """
+        cached = self.cache.get(user_id)
+        if cached is not None:
+            cached_at, friend_code = cached
+            if time.monotonic() - cached_at < self.cache_ttl:
+                return friend_code
+
+        try:
+            async with self.get_session().get(self.url_template.format(user_id)) as resp:
+                if resp.status == 200:
+                    friend_code = (await resp.json())["friendCode"]
+                elif resp.status == 404:
+                    friend_code = None
+                else:  # don't cache a server error
+                    return None
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return None
+
+        self.cache[user_id] = (time.monotonic(), friend_code)
+        return friend_code
+
+    async def get_friend_codes(self, user_ids):
+        """
+        Look up the friend codes of all of these users concurrently.
+
+        :param user_ids:
+        :return: a dictionary mapping user ID -|-> friend code or None
+        """
+        user_ids = list(user_ids)
+        friend_codes = await asyncio.gather(*[self.get_friend_code(user_id) for user_id in user_ids])
+        return dict(zip(user_ids, friend_codes))
+
+    async def set_friend_code(self, user_id, friend_code):
+        """
+        Associate this friend code with this user.
+
+        :param user_id:
+        :param friend_code:
+        :return: True if the server accepted the friend code; False otherwise
+        """
+        try:
+            async with self.get_session().put(
+                    self.url_template.format(user_id),
+                    data=json.dumps({"friendCode": friend_code})
+            ) as resp:
+                return resp.status == 200
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return False
+        finally:
+            self.invalidate(user_id)
+
+    async def unset_friend_code(self, user_id):
+        """
+        Remove this user's friend code.
+
+        :param user_id:
+        :return: True if the server removed the friend code; False otherwise
+        """
+        try:
+            async with self.get_session().delete(self.url_template.format(user_id)) as resp:
+                return resp.status == 200
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return False
+        finally:
+            self.invalidate(user_id)
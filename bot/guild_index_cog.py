@@ -0,0 +1,46 @@
+import discord
+from discord.ext.commands import Cog
+
+from bot.convert_using_guild import invalidate_guild_index, invalidate_all_guild_indices
+
+__author__ = 'Richard Liang'
+
+
+class GuildIndexCog(Cog):
+    """
+    A cog that keeps the guild indices used by bot.convert_using_guild current.
+
+    Whenever a guild's roles or emoji change, its index is dropped, to be rebuilt on the next lookup.  Changes
+    made while the bot was disconnected aren't replayed as events, so indices are also dropped whenever the
+    gateway delivers a guild's (or every guild's) state afresh.
+    """
+    def __init__(self, bot):
+        self.bot = bot
+
+    @Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role):
+        invalidate_guild_index(role.guild)
+
+    @Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        invalidate_guild_index(after.guild)
+
+    @Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        invalidate_guild_index(role.guild)
+
+    @Cog.listener()
+    async def on_guild_emojis_update(self, guild: discord.Guild, before, after):
+        invalidate_guild_index(guild)
+
+    @Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        invalidate_guild_index(guild)
+
+    @Cog.listener()
+    async def on_guild_available(self, guild: discord.Guild):
+        invalidate_guild_index(guild)
+
+    @Cog.listener()
+    async def on_ready(self):
+        invalidate_all_guild_indices()
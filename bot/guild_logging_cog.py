@@ -11,16 +11,16 @@ class GuildLoggingCog(BotPermsChecker, Cog):
     A cog that handles guild-specific logging in the GVRD guilds.
     """
     def __init__(self, bot, db, bot_permissions_db):
-        super(GuildLoggingCog, self).__init__(bot, bot_permissions_db)  # a BotPermsDB or workalike
+        super(GuildLoggingCog, self).__init__(bot, bot_permissions_db)  # an AsyncDB wrapping a BotPermsDB, or workalike
         self.bot = bot
-        self.db = db  # a GuildLoggingDB or workalike
+        self.db = db  # an AsyncDB wrapping a GuildLoggingDB, or workalike
 
-    def logging_configured(self, guild):
+    async def logging_configured(self, guild):
         """
         True if this guild's logging is configured; False otherwise.
         :return:
         """
-        logging_info = self.db.get_logging_info(guild)
+        logging_info = await self.db.get_logging_info(guild)
         return logging_info is not None
 
     @command(help="Display the guild's logging configuration.")
@@ -31,8 +31,8 @@ class GuildLoggingCog(BotPermsChecker, Cog):
         :param ctx:
         :return:
         """
-        self.can_configure_bot_validator(ctx)
-        logging_info = self.db.get_logging_info(ctx.guild)
+        await self.can_configure_bot_validator(ctx)
+        logging_info = await self.db.get_logging_info(ctx.guild)
         if logging_info is None:
             await ctx.message.channel.send(f'{ctx.author.mention} This guild does not have a log channel configured.')
             return
@@ -49,8 +49,8 @@ class GuildLoggingCog(BotPermsChecker, Cog):
         :param log_channel:
         :return:
         """
-        self.can_configure_bot_validator(ctx)
-        self.db.configure_guild_logging(ctx.guild, log_channel)
+        await self.can_configure_bot_validator(ctx)
+        await self.db.configure_guild_logging(ctx.guild, log_channel)
         await ctx.message.channel.send(
             f'{ctx.author.mention} Log channel is set to {log_channel}.'
         )
@@ -63,8 +63,8 @@ class GuildLoggingCog(BotPermsChecker, Cog):
         :param ctx:
         :return:
         """
-        self.can_configure_bot_validator(ctx)
-        self.db.clear_guild_logging(ctx.guild)
+        await self.can_configure_bot_validator(ctx)
+        await self.db.clear_guild_logging(ctx.guild)
         await ctx.message.channel.send(f"{ctx.author.mention} Logging is disabled for this guild.")
 
     async def log_to_channel(self, guild, *args, **kwargs):
@@ -76,7 +76,7 @@ class GuildLoggingCog(BotPermsChecker, Cog):
         :param guild:
         :return:
         """
-        logging_info = self.db.get_logging_info(guild)
+        logging_info = await self.db.get_logging_info(guild)
         if logging_info is None:
             return
 
@@ -0,0 +1,88 @@
+import time
+from collections import OrderedDict
+
+import discord
+
+
+class MessageCache(object):
+    """
+    A bounded, least-recently-used cache of discord.Message objects, keyed by (channel ID, message ID).
+
+    Entries are dropped after ttl seconds so that a message edited while we weren't watching is eventually
+    re-fetched; messages edited through their discord.Message object (e.g. relay messages) stay accurate
+    because discord.py updates the object in place.
+    """
+    def __init__(self, max_size=1000, ttl=3600):
+        """
+        :param max_size: the maximum number of messages to hold
+        :param ttl: the number of seconds to remember a message for
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.messages = OrderedDict()  # maps (channel ID, message ID) -|-> (time cached, discord.Message)
+
+    def get(self, channel_id, message_id):
+        """
+        Return the cached message, or None if it isn't cached (or its entry has expired).
+
+        :param channel_id:
+        :param message_id:
+        :return:
+        """
+        key = (channel_id, message_id)
+        cached = self.messages.get(key)
+        if cached is None:
+            return None
+        cached_at, message = cached
+        if time.monotonic() - cached_at >= self.ttl:
+            del self.messages[key]
+            return None
+        self.messages.move_to_end(key)
+        return message
+
+    def put(self, message: discord.Message):
+        """
+        Cache this message, evicting the least recently used message if the cache is full.
+
+        :param message:
+        :return:
+        """
+        key = (message.channel.id, message.id)
+        self.messages[key] = (time.monotonic(), message)
+        self.messages.move_to_end(key)
+        while len(self.messages) > self.max_size:
+            self.messages.popitem(last=False)
+
+    def discard(self, channel_id, message_id):
+        """
+        Forget this message if it's cached.
+
+        :param channel_id:
+        :param message_id:
+        :return:
+        """
+        self.messages.pop((channel_id, message_id), None)
+
+    async def fetch(self, channel: discord.TextChannel, message_id, refresh=False):
+        """
+        Return the message, retrieving it from Discord only if it isn't cached.
+
+        Raises discord.errors.NotFound (and forgets the message) if the message no longer exists.
+
+        :param channel:
+        :param message_id:
+        :param refresh: if True, always retrieve the message from Discord (e.g. for up-to-date reactions)
+        :return:
+        """
+        if not refresh:
+            message = self.get(channel.id, message_id)
+            if message is not None:
+                return message
+
+        try:
+            message = await channel.fetch_message(message_id)
+        except discord.errors.NotFound:
+            self.discard(channel.id, message_id)
+            raise
+        self.put(message)
+        return message
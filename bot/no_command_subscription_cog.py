@@ -621,3 +621,40 @@ class NoCommandSubscriptionCog(Cog):
         :return:
         """
         await self.reaction_clicked(payload)
+
+    @Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        """
+        Drop the guild's cached settings, as the deleted role may be registered for subscription.
+
+        :param role:
+        :return:
+        """
+        self.db.invalidate_settings(role.guild)
+
+    @Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        """
+        Drop the guild's cached settings, as the deleted channel may be the subscription channel or be associated
+        with a role.
+
+        :param channel:
+        :return:
+        """
+        self.db.invalidate_settings(channel.guild)
+
+    @Cog.listener()
+    async def on_guild_emojis_update(self, guild: discord.Guild, before, after):
+        """
+        Drop the guild's cached settings, as the show-subscriptions emoji may have changed.
+
+        :param guild:
+        :param before:
+        :param after:
+        :return:
+        """
+        self.db.invalidate_settings(guild)
+
+    @Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.db.invalidate_settings(guild)
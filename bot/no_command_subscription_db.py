@@ -16,11 +16,25 @@ from bot.convert_using_guild import role_converter, emoji_converter
 class NoCommandSubscriptionDB(object):
     """
     A class representing the SQLite database we use to store our information.
+
+    Each guild's settings are cached, with their roles, channels and emoji already resolved, the first time
+    they're read; the methods of this class that change a guild's settings drop its entry, as should anything
+    that might leave a resolved object stale (e.g. the deletion of a role or channel).
     """
     def __init__(self, path_to_db):
         self.path_to_db = path_to_db
         # This database can be initialized with no_command_subscription_initialization.sql.
         self.conn = sqlite3.connect(self.path_to_db)
+        self.settings_cache = {}  # maps guild ID -|-> resolved settings, or None if the guild has none
+
+    def invalidate_settings(self, guild: discord.Guild):
+        """
+        Drop this guild's cached settings so that they're read afresh next time.
+
+        :param guild:
+        :return:
+        """
+        self.settings_cache.pop(guild.id, None)
 
     def activate_no_command_subscription(self, guild: discord.Guild, subscription_channel: discord.TextChannel,
                                          instruction_message_text, instruction_message_id, wait_time: float,
@@ -66,6 +80,7 @@ class NoCommandSubscriptionDB(object):
                     emoji_type
                 )
             )
+        self.invalidate_settings(guild)
 
     def disable_no_command_subscription(self, guild: discord.Guild):
         """
@@ -82,6 +97,7 @@ class NoCommandSubscriptionDB(object):
                 "delete from no_command_subscription where guild_id = ?;",
                 (guild.id,)
             )
+        self.invalidate_settings(guild)
 
     def change_instruction_message(self, guild: discord.Guild, new_instruction_message_text: str):
         """
@@ -100,6 +116,7 @@ class NoCommandSubscriptionDB(object):
                 """,
                 (new_instruction_message_text, guild.id)
             )
+        self.invalidate_settings(guild)
 
     def change_wait_time(self, guild: discord.Guild, new_wait_time: float):
         """
@@ -118,6 +135,7 @@ class NoCommandSubscriptionDB(object):
                 """,
                 (new_wait_time, guild.id)
             )
+        self.invalidate_settings(guild)
 
     def change_show_subscriptions_emoji(self, guild: discord.Guild, new_show_subscriptions_emoji):
         """
@@ -142,6 +160,7 @@ class NoCommandSubscriptionDB(object):
                 """,
                 (emoji_stored_value, emoji_type, guild.id)
             )
+        self.invalidate_settings(guild)
 
     def register_roles(self, guild: discord.Guild, roles_to_register):
         """
@@ -159,6 +178,7 @@ class NoCommandSubscriptionDB(object):
                     "insert or ignore into no_command_role (guild_id, role_id) values (?, ?)",
                     (guild.id, role.id)
                 )
+        self.invalidate_settings(guild)
 
     def register_role(self, guild: discord.Guild, role: discord.Role, channel_list):
         """
@@ -193,6 +213,7 @@ class NoCommandSubscriptionDB(object):
                 "delete from no_command_role where guild_id = ? and role_id = ?",
                 (guild.id, role.id)
             )
+        self.invalidate_settings(guild)
 
     def deregister_all_roles(self, guild: discord.Guild):
         """
@@ -209,6 +230,7 @@ class NoCommandSubscriptionDB(object):
                 "delete from no_command_role where guild_id = ?",
                 (guild.id,)
             )
+        self.invalidate_settings(guild)
 
     def get_no_command_subscription_settings(self, guild: discord.Guild):
         """
@@ -221,6 +243,19 @@ class NoCommandSubscriptionDB(object):
          - show_subscriptions_emoji
          - roles: a dictionary keyed by role IDs, with values being lists of associated channels (or [])
 
+        The result is shared between callers and must not be modified.
+
+        :return:
+        """
+        if guild.id not in self.settings_cache:
+            self.settings_cache[guild.id] = self.read_no_command_subscription_settings(guild)
+        return self.settings_cache[guild.id]
+
+    def read_no_command_subscription_settings(self, guild: discord.Guild):
+        """
+        Read this guild's no-command subscription settings from the database, bypassing the cache.
+
+        :param guild:
         :return:
         """
         with self.conn:
@@ -231,7 +266,8 @@ class NoCommandSubscriptionDB(object):
                     instruction_message_id,
                     instruction_message_text,
                     wait_time,
-                    show_subscriptions_emoji
+                    show_subscriptions_emoji,
+                    show_subscriptions_emoji_type
                 from no_command_subscription
                 where guild_id = ?;
                 """,
@@ -240,6 +276,7 @@ class NoCommandSubscriptionDB(object):
             sub_tuple = sub_cursor.fetchone()
         if sub_tuple is None:
             return None
+        show_subscriptions_emoji_type = sub_tuple[-1]
 
         result = dict(
             zip(
@@ -250,22 +287,12 @@ class NoCommandSubscriptionDB(object):
                     "wait_time",
                     "show_subscriptions_emoji"
                 ],
-                sub_tuple
+                sub_tuple[:-1]
             )
         )
         result["subscription_channel"] = guild.get_channel(result["subscription_channel"])
 
         # Convert the show-subscriptions emoji to the appropriate type if it's a custom emoji.
-        with self.conn:
-            guild_info_cursor = self.conn.execute(
-                """
-                select show_subscriptions_emoji_type
-                from no_command_subscription 
-                where guild_id = ?;
-                """,
-                (guild.id,)
-            )
-            show_subscriptions_emoji_type = guild_info_cursor.fetchone()[0]
         if show_subscriptions_emoji_type == "custom":
             result["show_subscriptions_emoji"] = emoji_converter(guild, result["show_subscriptions_emoji"])
 
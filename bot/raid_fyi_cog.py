@@ -1,11 +1,10 @@
 from operator import attrgetter
-from collections import defaultdict
 import re
-import io
-import json
+from collections import deque
 from datetime import datetime, timezone, timedelta
-import requests
 import asyncio
+import logging
+import time
 
 import discord
 from discord.ext.commands import command, BadArgument, EmojiConverter, Cog,\
@@ -14,10 +13,15 @@ from discord.ext import tasks
 from botocore.exceptions import BotoCoreError
 
 from bot.bot_perms_cog import BotPermsChecker
-from bot.utils import break_up_long_message
+from bot.utils import break_up_long_message, JSONArrayFile
+from bot.raid_fyi_db import reaction_template, reactions_by_member
+from bot.friend_code_client import FriendCodeClient
+from bot.message_cache import MessageCache
 
 __author__ = 'Richard Liang'
 
+logger = logging.getLogger(__name__)
+
 
 class RaidFYICog(BotPermsChecker, Cog):
     """
@@ -39,29 +43,85 @@ class RaidFYICog(BotPermsChecker, Cog):
             friend_code_cleanup_delay=15,
             friend_code_cleanup_get_fc_delay=300,
             friend_code_suppress_code_reaction="🔏",
-            logging_cog=None
+            logging_cog=None,
+            fyi_refresh_delay=2,
+            friend_code_cache_ttl=600,
+            clean_up_concurrency=4,
+            clean_up_guild_timeout=300,
+            schedule_expiry=False,
+            fyi_post_concurrency=4,
+            message_cache_size=1000,
+            message_cache_ttl=3600,
+            relay_edit_interval=1
     ):
-        super(RaidFYICog, self).__init__(bot, bot_permissions_db)  # a BotPermsDB or workalike
-        self.db = db  # a RaidFYIDB or workalike
+        super(RaidFYICog, self).__init__(bot, bot_permissions_db)  # an AsyncDB wrapping a BotPermsDB, or workalike
+        self.db = db  # an AsyncDB wrapping a RaidFYIDB, or workalike
         self.logging_cog = logging_cog  # a GuildLoggingCog or workalike
-        self.friend_code_url_template = friend_code_url_template
-        self.friend_code_server_headers = {
-            "x-api-key": friend_code_server_x_api_key,
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
+        self.friend_code_client = None
+        if friend_code_url_template is not None and friend_code_server_x_api_key is not None:
+            self.friend_code_client = FriendCodeClient(
+                friend_code_url_template,
+                friend_code_server_x_api_key,
+                cache_ttl=friend_code_cache_ttl,
+            )
         self.friend_code_cleanup_delay = friend_code_cleanup_delay
         self.friend_code_cleanup_get_fc_delay = friend_code_cleanup_get_fc_delay
         self.friend_code_suppress_code_reaction = friend_code_suppress_code_reaction
+        # Reactions on an FYI that arrive within fyi_refresh_delay seconds of each other are
+        # coalesced into a single refresh of its relay messages.
+        self.fyi_refresh_delay = fyi_refresh_delay
+        self.fyi_refresh_requests = {}  # maps (chat channel ID, command message ID) -|-> latest refresh arguments
+        self.fyi_refresh_tasks = {}  # maps (chat channel ID, command message ID) -|-> task performing the refresh
+        # The reactions on each FYI we've seen since startup, kept up to date from reaction events; the changes
+        # not yet written to the database are also recorded (as entry -|-> True if added, False if removed).
+        self.fyi_reactions = {}  # maps (chat channel ID, command message ID) -|-> set of reaction entries
+        self.fyi_reaction_changes = {}  # maps (chat channel ID, command message ID) -|-> {entry: added}
+        self.fyi_refresh_failures = {}  # maps (chat channel ID, command message ID) -|-> consecutive failed refreshes
+        # While an FYI's reactions are being rescanned from its messages, the reaction events that arrive are also
+        # recorded for each rescan in progress, as they may not be reflected in its result.
+        self.fyi_rescans = {}  # maps (chat channel ID, command message ID) -|-> list of {entry: added}
+        # Each relay message is edited at most once every relay_edit_interval seconds, always to the newest content
+        # requested for it; discord.py waits out the edit route's rate limit bucket if it is exhausted.
+        self.relay_edit_interval = relay_edit_interval
+        self.relay_edit_requests = {}  # maps (channel ID, message ID) -|-> (discord.Message, newest content)
+        self.relay_edit_tasks = {}  # maps (channel ID, message ID) -|-> task performing the edits
+        # The .fyi command makes at most this many Discord requests at once.
+        self.fyi_post_concurrency = fyi_post_concurrency
+        self.fyi_post_latencies = deque(maxlen=100)  # seconds taken by the most recent .fyi commands
+        # The command and relay messages of FYIs, so that refreshing an FYI doesn't re-fetch them from Discord.
+        self.fyi_messages = MessageCache(max_size=message_cache_size, ttl=message_cache_ttl)
+        # The periodic clean-up sweeps up to clean_up_concurrency guilds at once, and gives up on a guild
+        # (until the next sweep) if it takes longer than clean_up_guild_timeout seconds.
+        self.clean_up_concurrency = clean_up_concurrency
+        self.clean_up_guild_timeout = clean_up_guild_timeout
+        self.clean_up_stats = {}  # maps guild ID -|-> statistics from that guild's most recent periodic clean-up
+        # If the database's FYIs expire via DynamoDB's Time To Live, the periodic clean-up only logs each guild's
+        # FYIs that expired since its last run, and leaves deleting them to DynamoDB.  These cutoffs are only kept
+        # in memory, so after a restart the first clean-up logs again any expired FYIs DynamoDB hasn't deleted yet.
+        self.ttl_cleaned_up_through = {}  # maps guild ID -|-> expiry cutoff of its last periodic clean-up
         self.clean_up_fyis_loop.change_interval(
             hours=clean_up_hours,
             minutes=clean_up_minutes,
             seconds=clean_up_seconds
         )
         # self.clean_up_fyis_loop.start()
+        # If schedule_expiry is set, each FYI is cleaned up as soon as it expires instead.
+        self.expiry_wakeup = asyncio.Event()
+        self.expiry_failures = {}  # maps guild ID -|-> consecutive failed scheduled clean-ups
+        self.expiry_scheduler_task = None
+        if schedule_expiry:
+            self.expiry_scheduler_task = self.bot.loop.create_task(self.expiry_scheduler())
 
     def cog_unload(self):
         self.clean_up_fyis_loop.cancel()
+        if self.expiry_scheduler_task is not None:
+            self.expiry_scheduler_task.cancel()
+        for task in self.fyi_refresh_tasks.values():
+            task.cancel()
+        for task in self.relay_edit_tasks.values():
+            task.cancel()
+        if self.friend_code_client is not None:
+            self.bot.loop.create_task(self.friend_code_client.close())
 
     @command(
         help="Configure raid FYI functionality.",
@@ -81,7 +141,7 @@ class RaidFYICog(BotPermsChecker, Cog):
         :param timezone_str: string describing the guild's timezone, as understood by pytz
         :return:
         """
-        self.can_configure_bot_validator(ctx)
+        await self.can_configure_bot_validator(ctx)
 
         emoji_converter = EmojiConverter()
         try:
@@ -89,7 +149,7 @@ class RaidFYICog(BotPermsChecker, Cog):
         except BadArgument:
             actual_emoji = fyi_emoji
 
-        self.db.configure_fyi(ctx.guild, actual_emoji, timezone_str)
+        await self.db.configure_fyi(ctx.guild, actual_emoji, timezone_str)
         await ctx.channel.send(f"{ctx.author.mention} Raid FYI functionality is now enabled.")
 
     @command(
@@ -103,8 +163,8 @@ class RaidFYICog(BotPermsChecker, Cog):
         :param ctx:
         :return:
         """
-        self.can_configure_bot_validator(ctx)
-        self.db.deactivate_guild_fyi(ctx.guild)
+        await self.can_configure_bot_validator(ctx)
+        await self.db.deactivate_guild_fyi(ctx.guild)
         await ctx.channel.send(f"{ctx.author.mention} Raid FYI functionality is now disabled.")
 
     @command(
@@ -129,7 +189,7 @@ class RaidFYICog(BotPermsChecker, Cog):
         :param relay_to_chat:
         :return:
         """
-        self.can_configure_bot_validator(ctx)
+        await self.can_configure_bot_validator(ctx)
 
         emoji_converter = EmojiConverter()
         try:
@@ -147,7 +207,7 @@ class RaidFYICog(BotPermsChecker, Cog):
         except BadArgument:
             actual_cancelled_emoji = cancelled_emoji
 
-        self.db.activate_enhanced_fyi(
+        await self.db.activate_enhanced_fyi(
             ctx.guild,
             actual_rsvp_emoji,
             actual_remote_emoji,
@@ -167,8 +227,8 @@ class RaidFYICog(BotPermsChecker, Cog):
         :param ctx:
         :return:
         """
-        self.can_configure_bot_validator(ctx)
-        self.db.deactivate_enhanced_fyi(ctx.guild)
+        await self.can_configure_bot_validator(ctx)
+        await self.db.deactivate_enhanced_fyi(ctx.guild)
         await ctx.channel.send(f"{ctx.author.mention} Raid FYI functionality is now disabled.")
 
     async def map_chat_to_fyi_helper(
@@ -190,7 +250,7 @@ class RaidFYICog(BotPermsChecker, Cog):
         :param timeout_in_hours:
         :return:
         """
-        self.db.register_fyi_channel_mapping(guild, chat_channel, fyi_channel, timeout_in_hours)
+        await self.db.register_fyi_channel_mapping(guild, chat_channel, fyi_channel, timeout_in_hours)
         await command_channel.send(
             f"{commander.mention} FYIs from {chat_channel} will be posted in {fyi_channel} "
             f"and time out after {timeout_in_hours} hours."
@@ -213,7 +273,7 @@ class RaidFYICog(BotPermsChecker, Cog):
         :param timeout_in_hours:
         :return:
         """
-        self.can_configure_bot_validator(ctx)
+        await self.can_configure_bot_validator(ctx)
         await self.map_chat_to_fyi_helper(
             ctx.guild,
             ctx.author,
@@ -240,10 +300,10 @@ class RaidFYICog(BotPermsChecker, Cog):
         :param timeout_in_hours:
         :return:
         """
-        self.can_configure_bot_validator(ctx)
+        await self.can_configure_bot_validator(ctx)
         await ctx.channel.send(f"{ctx.author.mention} FYIs in all channels in {category} "
                                f"will be posted in {fyi_channel} and time out after {timeout_in_hours} hours.")
-        self.db.register_fyi_category_mapping(ctx.guild, category, fyi_channel, timeout_in_hours)
+        await self.db.register_fyi_category_mapping(ctx.guild, category, fyi_channel, timeout_in_hours)
         for channel in category.channels:
             await self.map_chat_to_fyi_helper(
                 ctx.guild,
@@ -254,6 +314,36 @@ class RaidFYICog(BotPermsChecker, Cog):
                 timeout_in_hours
             )
 
+    @Cog.listener()
+    async def on_ready(self):
+        """
+        Index the active FYIs of every guild we haven't indexed yet.
+
+        Until a guild is indexed, events in that guild are checked against the database as usual.
+        :return:
+        """
+        for guild in self.bot.guilds:
+            if guild.id not in self.db.indexed_guilds:
+                await self.db.index_active_fyis(guild)
+        self.expiry_wakeup.set()
+
+    @Cog.listener()
+    async def on_guild_join(self, guild):
+        await self.db.index_active_fyis(guild)
+        self.expiry_wakeup.set()
+
+    @Cog.listener()
+    async def on_guild_emojis_update(self, guild: discord.Guild, before, after):
+        """
+        Drop the guild's cached FYI configuration, as its custom emoji may have changed.
+
+        :param guild:
+        :param before:
+        :param after:
+        :return:
+        """
+        self.db.invalidate_fyi_info(guild)
+
     @Cog.listener()
     async def on_guild_channel_create(self, channel: discord.TextChannel):
         """
@@ -265,11 +355,11 @@ class RaidFYICog(BotPermsChecker, Cog):
         # if the channel is itself a category!).
         if channel.category is None:
             return
-        category_mapping_info = self.db.get_fyi_category(channel.category)
+        category_mapping_info = await self.db.get_fyi_category(channel.category)
         if category_mapping_info is None:
             return
         # This channel belongs to a mapped category, so we configure its FYI mapping.
-        self.db.register_fyi_channel_mapping(
+        await self.db.register_fyi_channel_mapping(
             channel.guild,
             channel,
             category_mapping_info["relay_channel"],
@@ -292,8 +382,8 @@ class RaidFYICog(BotPermsChecker, Cog):
         :param chat_channel:
         :return:
         """
-        self.can_configure_bot_validator(ctx)
-        self.db.deregister_fyi_channel_mapping(ctx.guild, chat_channel)
+        await self.can_configure_bot_validator(ctx)
+        await self.db.deregister_fyi_channel_mapping(ctx.guild, chat_channel)
         await ctx.channel.send(f"{ctx.author.mention} FYIs from {chat_channel} will now be ignored.")
 
     @command(help="De-register FYI functionality for all channels")
@@ -304,7 +394,7 @@ class RaidFYICog(BotPermsChecker, Cog):
         :param ctx:
         :return:
         """
-        self.db.deregister_all_fyi_channel_mappings(ctx.guild)
+        await self.db.deregister_all_fyi_channel_mappings(ctx.guild)
         await ctx.channel.send(f"{ctx.author.mention} FYIs from all channels will now be ignored.")
 
     @command(help="De-register FYI functionality for the specified chat channel")
@@ -316,8 +406,8 @@ class RaidFYICog(BotPermsChecker, Cog):
         :param category:
         :return:
         """
-        self.can_configure_bot_validator(ctx)
-        self.db.deregister_fyi_category_mapping(ctx.guild, category)
+        await self.can_configure_bot_validator(ctx)
+        await self.db.deregister_fyi_category_mapping(ctx.guild, category)
         await ctx.channel.send(
             f"{ctx.author.mention} New channels created in {category} will no longer "
             f"be automatically configured for FYIs.")
@@ -330,8 +420,8 @@ class RaidFYICog(BotPermsChecker, Cog):
         :param ctx:
         :return:
         """
-        self.can_configure_bot_validator(ctx)
-        fyi_info = self.db.get_fyi_info(ctx.guild)
+        await self.can_configure_bot_validator(ctx)
+        fyi_info = await self.db.get_fyi_info(ctx.guild)
         if fyi_info is None:
             await ctx.channel.send(f"{ctx.author.mention} Raid FYI functionality is not configured.")
             return
@@ -415,36 +505,26 @@ Cancelled emoji: {fyi_info["cancelled_emoji"] if fyi_info["enhanced"] else "(Non
         )
         return relay_message
 
-    def build_interested_users_list_string(self, interested):
+    async def build_interested_users_list_string(self, interested):
         """
         Build a string representation of the interested users.
-        :param interested: a dictionary mapping member -> [reactions used by the user]
+        :param interested: a dictionary mapping member -> [reactions used by the user, rendered as strings]
         :return:
         """
         sorted_interested = sorted(interested.keys(), key=attrgetter("display_name"))
+
+        # If we're configured for it, look up everyone's friend codes at once.
+        friend_codes = {}
+        if self.friend_code_client is not None:
+            friend_codes = await self.friend_code_client.get_friend_codes(
+                [person.id for person in sorted_interested
+                 if self.friend_code_suppress_code_reaction not in interested[person]]
+            )
+
         user_entries = []
         for person in sorted_interested:
-            suppress_code = False
-            person_reaction_strings = []
-            for emoji in interested[person]:
-                if isinstance(emoji, str):
-                    person_reaction_strings.append(emoji)
-                else:  # this is a custom emoji
-                    person_reaction_strings.append(f"<:{emoji.name}:{emoji.id}>")
-                if emoji == self.friend_code_suppress_code_reaction:
-                    suppress_code = True
-
-            # If we're configured for it, look for a friend code.
-            friend_code = None
-            if (not suppress_code
-                    and self.friend_code_server_headers["x-api-key"] is not None
-                    and self.friend_code_url_template is not None):
-                resp = requests.get(
-                    self.friend_code_url_template.format(person.id),
-                    headers=self.friend_code_server_headers
-                )
-                friend_code = resp.json()["friendCode"] if resp.status_code == 200 else None
-
+            person_reaction_strings = sorted(interested[person])
+            friend_code = friend_codes.get(person.id)
             user_entry = f"{person.mention} ({', '.join(person_reaction_strings)})"
             if friend_code is not None:
                 user_entry += f" [{friend_code}]"
@@ -482,6 +562,8 @@ Cancelled emoji: {fyi_info["cancelled_emoji"] if fyi_info["enhanced"] else "(Non
         "{interested_users_str}"
     )
     RELAY_MESSAGE_NONE_INTERESTED_YET = "(none so far)"
+    # A failed refresh of an FYI is retried as a full reconcile up to this many times in a row.
+    FYI_REFRESH_MAX_ATTEMPTS = 3
 
     @command(
         help="Post an FYI to the corresponding FYI channel.",
@@ -493,7 +575,7 @@ Cancelled emoji: {fyi_info["cancelled_emoji"] if fyi_info["enhanced"] else "(Non
         :param ctx:
         :return:
         """
-        fyi_info = self.db.get_fyi_info(ctx.guild)
+        fyi_info = await self.db.get_fyi_info(ctx.guild)
         if fyi_info is None:
             return
         if ctx.channel not in fyi_info["channel_mappings"]:
@@ -504,6 +586,7 @@ Cancelled emoji: {fyi_info["cancelled_emoji"] if fyi_info["enhanced"] else "(Non
         if stripped_content is None:
             return
 
+        start = time.monotonic()
         timestamp = datetime.now(timezone.utc)
         relay_channel = mapping_info["relay_channel"]
         relay_message_text = self.build_relay_message_text(
@@ -530,20 +613,31 @@ Cancelled emoji: {fyi_info["cancelled_emoji"] if fyi_info["enhanced"] else "(Non
                 interested_users_str=self.RELAY_MESSAGE_NONE_INTERESTED_YET
             )
 
-        relay_message = await relay_channel.send(
-            full_message_text,
-            allowed_mentions=discord.AllowedMentions.none(),
-        )
-        chat_relay_message_id = None
-        chat_relay_message = None
+        # The relay messages, and then the reactions on each message, are sent concurrently (subject to
+        # fyi_post_concurrency); the database write happens while the reactions are being added.
+        semaphore = asyncio.Semaphore(self.fyi_post_concurrency)
+
+        async def limited(coro):
+            async with semaphore:
+                return await coro
+
+        relay_sends = [
+            limited(relay_channel.send(full_message_text, allowed_mentions=discord.AllowedMentions.none()))
+        ]
         if fyi_info["relay_to_chat"]:
-            chat_relay_message = await ctx.channel.send(full_message_text)
-            chat_relay_message_id = chat_relay_message.id
+            relay_sends.append(limited(ctx.channel.send(full_message_text)))
+        relay_message, *chat_relay_messages = await asyncio.gather(*relay_sends)
+        chat_relay_message = chat_relay_messages[0] if len(chat_relay_messages) > 0 else None
+        chat_relay_message_id = chat_relay_message.id if chat_relay_message is not None else None
+        for fyi_message in [ctx.message, relay_message, chat_relay_message]:
+            if fyi_message is not None:
+                self.fyi_messages.put(fyi_message)
+        relays_sent = time.monotonic()
 
         expiry = None
         if mapping_info["timeout_in_hours"] is not None:
             expiry = timestamp + timedelta(hours=int(mapping_info["timeout_in_hours"]))
-        self.db.add_fyi(
+        add_fyi = self.db.add_fyi(
             ctx.guild,
             creator=ctx.author,
             fyi_text=ctx.message.content,
@@ -556,31 +650,114 @@ Cancelled emoji: {fyi_info["cancelled_emoji"] if fyi_info["enhanced"] else "(Non
             chat_relay_message_id=chat_relay_message_id
         )
 
-        await ctx.message.add_reaction(fyi_info["fyi_emoji"])
+        async def add_reactions(message, emojis):
+            # Reactions on a single message are added in order, so that they appear in that order.
+            async with semaphore:
+                for emoji in emojis:
+                    await message.add_reaction(emoji)
+
+        reaction_sets = [add_reactions(ctx.message, [fyi_info["fyi_emoji"]])]
+        if fyi_info["enhanced"]:
+            rsvp_emojis = [fyi_info["rsvp_emoji"], fyi_info["remote_emoji"]]
+            reaction_sets = [
+                add_reactions(ctx.message, [fyi_info["fyi_emoji"]] + rsvp_emojis),
+                add_reactions(relay_message, rsvp_emojis),
+            ]
+            if chat_relay_message is not None:
+                reaction_sets.append(add_reactions(chat_relay_message, rsvp_emojis))
+
+        fyi_record, *reaction_results = await asyncio.gather(add_fyi, *reaction_sets, return_exceptions=True)
+        if isinstance(fyi_record, BaseException):
+            raise fyi_record
+        # Members may have reacted before the FYI was in the database, in which case those reaction events were
+        # ignored; so start tracking its reactions now, and rescan them from its messages once.
+        self.fyi_reactions[(ctx.channel.id, ctx.message.id)] = set()
         if fyi_info["enhanced"]:
-            await ctx.message.add_reaction(fyi_info["rsvp_emoji"])
-            await ctx.message.add_reaction(fyi_info["remote_emoji"])
-            await relay_message.add_reaction(fyi_info["rsvp_emoji"])
-            await relay_message.add_reaction(fyi_info["remote_emoji"])
-            if fyi_info["relay_to_chat"]:
-                await chat_relay_message.add_reaction(fyi_info["rsvp_emoji"])
-                await chat_relay_message.add_reaction(fyi_info["remote_emoji"])
+            self.request_fyi_refresh(ctx.guild, fyi_record, fyi_info, reconcile=True)
+        self.expiry_wakeup.set()
+        for result in reaction_results:
+            if isinstance(result, BaseException):
+                raise result
+
+        finished = time.monotonic()
+        self.fyi_post_latencies.append(finished - start)
+        logger.info(
+            f"Posted FYI {ctx.message.id} in guild {ctx.guild.id} in {(finished - start) * 1000:.0f} ms "
+            f"(relay messages sent after {(relays_sent - start) * 1000:.0f} ms)"
+        )
 
     async def get_all_reactors(self, messages):
         """
-        Compile a dictionary of all users/members who reacted to the specified messages.
+        Compile all of the reactions that users/members have added to the specified messages.
+
+        This fetches every reactor of every reaction, so it is only used to reconcile our record of an FYI's
+        reactions; otherwise, that record is kept up to date from reaction events.
+
         :param messages: a list of messages
-        :return:
+        :return: a set of reaction entries (as produced by reaction_template)
         """
-        reactors = defaultdict(set)
+        reactions = set()
         for message in messages:
             for reaction in message.reactions:
                 async for user in reaction.users():
                     if user == self.bot.user:
                         continue
-                    reactors[user].add(reaction.emoji)
+                    reactions.add(reaction_template.format(message.id, user.id, reaction.emoji))
+        return reactions
+
+    def resolve_reactors(self, guild, reactions):
+        """
+        Convert a set of reaction entries into a dictionary mapping member -> set of emoji used by that member.
+
+        Reactors who can no longer be found are omitted.
+
+        :param guild:
+        :param reactions: a set of reaction entries (as produced by reaction_template)
+        :return:
+        """
+        reactors = {}
+        for member_id, emoji in reactions_by_member(reactions).items():
+            person = guild.get_member(member_id)
+            if person is None:
+                person = self.bot.get_user(member_id)
+            if person is not None:
+                reactors[person] = emoji
         return reactors
 
+    @staticmethod
+    def fyi_key(fyi_info):
+        """
+        The key under which we track this FYI's pending refreshes and reactions.
+
+        :param fyi_info: an FYIRecord as returned by RaidFYIDB.get_fyi
+        :return:
+        """
+        return fyi_info.key
+
+    def forget_fyi_reactions(self, fyi_info):
+        """
+        Stop tracking this FYI's reactions (e.g. because it is no longer active).
+
+        :param fyi_info: an FYIRecord as returned by RaidFYIDB.get_fyi
+        :return:
+        """
+        key = self.fyi_key(fyi_info)
+        self.fyi_reactions.pop(key, None)
+        self.fyi_reaction_changes.pop(key, None)
+        self.fyi_refresh_failures.pop(key, None)
+
+    def forget_fyi_messages(self, fyi_info):
+        """
+        Drop this FYI's messages from the message cache.
+
+        :param fyi_info: an FYIRecord as returned by RaidFYIDB.get_fyi
+        :return:
+        """
+        self.fyi_messages.discard(fyi_info.chat_channel_id, fyi_info.command_message_id)
+        self.fyi_messages.discard(fyi_info.relay_channel_id, fyi_info.relay_message_id)
+        if fyi_info.chat_relay_message_id is not None:
+            self.fyi_messages.discard(fyi_info.chat_channel_id, fyi_info.chat_relay_message_id)
+
     async def update_fyi_helper(
             self,
             guild,
@@ -588,48 +765,122 @@ Cancelled emoji: {fyi_info["cancelled_emoji"] if fyi_info["enhanced"] else "(Non
             tz,
             rsvp_emoji=None,
             remote_emoji=None,
+            reactions=None,
     ):
         """
         Helper that updates an FYI when anything changes.
 
+        If the FYI's reactions are rescanned, the reaction events that arrive meanwhile are recorded, so that
+        the changes the scan misses can be applied on top of its result.
+
         :param guild:
-        :param fyi_info: a dictionary as returned by RaidFYIDB.get_fyi
+        :param fyi_info: an FYIRecord as returned by RaidFYIDB.get_fyi
         :param tz: a Python timezone object as returned by pytz.timezone
         :param rsvp_emoji: the guild's RSVP emoji, or None (if the guild does not have enhanced FYI on)
         :param remote_emoji: the guild's remote emoji, or None (if the guild does not have enhanced FYI on)
-        :return:
+        :param reactions: the FYI's current reaction entries, or None to rescan them from its messages and
+        record the result
+        :return: see update_fyi_messages
+        """
+        if rsvp_emoji is None or reactions is not None:
+            return await self.update_fyi_messages(guild, fyi_info, tz, rsvp_emoji, remote_emoji, reactions)
+
+        key = self.fyi_key(fyi_info)
+        rescan_changes = {}
+        self.fyi_rescans.setdefault(key, []).append(rescan_changes)
+        try:
+            return await self.update_fyi_messages(guild, fyi_info, tz, rsvp_emoji, remote_emoji,
+                                                  rescan_changes=rescan_changes)
+        finally:
+            rescans = [x for x in self.fyi_rescans.get(key, []) if x is not rescan_changes]
+            if len(rescans) > 0:
+                self.fyi_rescans[key] = rescans
+            else:
+                self.fyi_rescans.pop(key, None)
+
+    async def update_fyi_messages(
+            self,
+            guild,
+            fyi_info,
+            tz,
+            rsvp_emoji=None,
+            remote_emoji=None,
+            reactions=None,
+            rescan_changes=None
+    ):
         """
+        Re-render an FYI's relay messages, and record its latest text (and rescanned reactions, if any).
+
+        :param guild:
+        :param fyi_info: an FYIRecord as returned by RaidFYIDB.get_fyi
+        :param tz: a Python timezone object as returned by pytz.timezone
+        :param rsvp_emoji: the guild's RSVP emoji, or None (if the guild does not have enhanced FYI on)
+        :param remote_emoji: the guild's remote emoji, or None (if the guild does not have enhanced FYI on)
+        :param reactions: the FYI's current reaction entries, or None to rescan them from its messages and
+        record the result
+        :param rescan_changes: when rescanning, the reaction events recorded since the rescan began
+        (as entry -|-> True if added, False if removed), which are applied on top of the scan
+        :return: a pair (relay message text, dictionary mapping reactor -|-> set of emoji), or None if any of the
+        FYI's messages no longer exist
+        """
+        # Rescanning the reactions needs them fresh from Discord; otherwise cached messages will do.
+        refresh = rsvp_emoji is not None and reactions is None
         try:
-            command_message = await fyi_info["chat_channel"].fetch_message(fyi_info["command_message_id"])
+            command_message = await self.fyi_messages.fetch(
+                fyi_info.chat_channel,
+                fyi_info.command_message_id,
+                refresh=refresh
+            )
         except discord.errors.NotFound:
             return
 
         try:
-            relay_message = await fyi_info["relay_channel"].fetch_message(fyi_info["relay_message_id"])
+            relay_message = await self.fyi_messages.fetch(
+                fyi_info.relay_channel,
+                fyi_info.relay_message_id,
+                refresh=refresh
+            )
         except discord.errors.NotFound:
             return
 
         chat_relay_message = None
-        if fyi_info.get("chat_relay_message_id") is not None:
+        if fyi_info.chat_relay_message_id is not None:
             try:
-                chat_relay_message = await fyi_info["chat_channel"].fetch_message(fyi_info["chat_relay_message_id"])
+                chat_relay_message = await self.fyi_messages.fetch(
+                    fyi_info.chat_channel,
+                    fyi_info.chat_relay_message_id,
+                    refresh=refresh
+                )
             except discord.errors.NotFound:
                 return
 
         relay_message_text = self.build_relay_message_text(
-            fyi_info["creator"],
-            fyi_info["timestamp"],
+            fyi_info.creator,
+            fyi_info.timestamp,
             tz,
             self.strip_fyi_message_content(command_message)
         )
 
         full_message_text = relay_message_text
-        reactors = []
+        reactors = {}
+        new_reactions = None
         if rsvp_emoji is not None:
-            fyi_messages = [command_message, relay_message]
-            if chat_relay_message is not None:
-                fyi_messages.append(chat_relay_message)
-            reactors = await self.get_all_reactors(fyi_messages)
+            if reactions is None:
+                fyi_messages = [command_message, relay_message]
+                if chat_relay_message is not None:
+                    fyi_messages.append(chat_relay_message)
+                new_reactions = await self.get_all_reactors(fyi_messages)
+                # The scan may have missed reactions added or removed while it ran, so apply those on top.
+                for reaction, added in (rescan_changes or {}).items():
+                    if added:
+                        new_reactions.add(reaction)
+                    else:
+                        new_reactions.discard(reaction)
+                reactions = new_reactions
+                key = self.fyi_key(fyi_info)
+                self.fyi_reactions[key] = set(new_reactions)
+                self.fyi_reaction_changes.pop(key, None)
+            reactors = self.resolve_reactors(guild, reactions)
 
             rsvp_emoji_rendered = rsvp_emoji
             if not isinstance(rsvp_emoji, str):
@@ -640,7 +891,7 @@ Cancelled emoji: {fyi_info["cancelled_emoji"] if fyi_info["enhanced"] else "(Non
 
             interested_users_str = self.RELAY_MESSAGE_NONE_INTERESTED_YET
             if len(reactors) > 0:
-                interested_users_str = self.build_interested_users_list_string(reactors)
+                interested_users_str = await self.build_interested_users_list_string(reactors)
             full_message_text = self.RELAY_MESSAGE_TEMPLATE.format(
                 relay_message_text=relay_message_text,
                 rsvp_emoji=rsvp_emoji_rendered,
@@ -648,40 +899,200 @@ Cancelled emoji: {fyi_info["cancelled_emoji"] if fyi_info["enhanced"] else "(Non
                 interested_users_str=interested_users_str
             )
 
-        self.db.update_fyi(
-            guild,
-            command_message.channel,
-            command_message.id,
-            command_message.content,
-            [x.id for x in reactors]
-        )
-        await relay_message.edit(content=full_message_text)
+        new_fyi_text = command_message.content
+        if new_fyi_text == fyi_info.latest_edit:
+            new_fyi_text = None
+        if new_fyi_text is not None or new_reactions is not None:
+            await self.db.update_fyi(
+                guild,
+                command_message.channel,
+                command_message.id,
+                new_fyi_text,
+                new_reactions
+            )
+        self.request_relay_edit(relay_message, full_message_text)
         if chat_relay_message is not None:
-            await chat_relay_message.edit(content=full_message_text)
+            self.request_relay_edit(chat_relay_message, full_message_text)
 
         return relay_message_text, reactors
 
-    async def update_fyi_interested(self, payload):
+    def pending_relay_content(self, message: discord.Message):
+        """
+        Return the content this relay message will have once its pending edit (if any) is made.
+
+        :param message:
+        :return:
+        """
+        pending = self.relay_edit_requests.get((message.channel.id, message.id))
+        return pending[1] if pending is not None else message.content
+
+    def request_relay_edit(self, message: discord.Message, content):
+        """
+        Schedule an edit of this relay message, superseding any edit of it that is still pending.
+
+        Nothing is scheduled if the message already shows this content.
+
+        :param message:
+        :param content:
+        :return:
+        """
+        key = (message.channel.id, message.id)
+        if key not in self.relay_edit_tasks and message.content == content:
+            return
+        self.relay_edit_requests[key] = (message, content)
+        if key not in self.relay_edit_tasks:
+            self.relay_edit_tasks[key] = self.bot.loop.create_task(self.relay_edits(key))
+
+    async def relay_edits(self, key):
+        """
+        Edit the relay message to the most recently requested content, then wait out the edit interval before
+        making any edit requested in the meantime.
+
+        A failed edit is logged and not retried, though an edit requested in the meantime is still attempted;
+        if the message no longer exists, any pending edit is dropped.
+
+        :param key: a (channel ID, message ID) pair
+        :return:
+        """
+        try:
+            while key in self.relay_edit_requests:
+                message, content = self.relay_edit_requests.pop(key)
+                if message.content == content:
+                    continue
+                try:
+                    await message.edit(content=content)
+                except discord.errors.NotFound:
+                    self.fyi_messages.discard(*key)
+                    return
+                except discord.errors.HTTPException:
+                    logger.exception(f"Could not edit relay message {key}")
+                    self.fyi_messages.discard(*key)
+                await asyncio.sleep(self.relay_edit_interval)
+        finally:
+            # If we stopped early, don't leave an edit pending with nothing to make it.
+            self.relay_edit_requests.pop(key, None)
+            self.relay_edit_tasks.pop(key, None)
+
+    async def update_fyi_interested(self, payload, added):
         """
         Updates an FYI when a reaction is clicked.
 
         :param payload:
+        :param added: True if the reaction was added, False if it was removed
         :return:
         """
         if payload.user_id == self.bot.user.id:
             return
+        if not self.db.might_be_active_fyi_message(payload.guild_id, payload.message_id):
+            return
         guild = self.bot.get_guild(payload.guild_id)
-        guild_fyi_info = self.db.get_fyi_info(guild)
-        fyi_info = self.db.get_fyi(guild, guild.get_channel(payload.channel_id), payload.message_id)
+        guild_fyi_info = await self.db.get_fyi_info(guild)
+        fyi_info = await self.db.get_fyi(guild, guild.get_channel(payload.channel_id), payload.message_id,
+                                         projection="roster")
         # Do nothing if this isn't an active FYI.
-        if guild_fyi_info is None or not guild_fyi_info["enhanced"] or fyi_info is None or not fyi_info["active"]:
+        if guild_fyi_info is None or not guild_fyi_info["enhanced"] or fyi_info is None or not fyi_info.active:
+            return
+
+        key = self.fyi_key(fyi_info)
+        reaction = reaction_template.format(payload.message_id, payload.user_id, payload.emoji)
+        # A rescan of this FYI's reactions that is under way may already have passed this one.
+        for rescan_changes in self.fyi_rescans.get(key, []):
+            rescan_changes[reaction] = added
+        if key not in self.fyi_reactions:
+            # We haven't tracked this FYI's reactions since startup, so rescan them all.
+            self.request_fyi_refresh(guild, fyi_info, guild_fyi_info, reconcile=True)
             return
+        if added:
+            self.fyi_reactions[key].add(reaction)
+        else:
+            self.fyi_reactions[key].discard(reaction)
+        self.fyi_reaction_changes.setdefault(key, {})[reaction] = added
+        self.request_fyi_refresh(guild, fyi_info, guild_fyi_info)
+
+    def request_fyi_refresh(self, guild, fyi_info, guild_fyi_info, reconcile=False):
+        """
+        Schedule a refresh of this FYI's relay messages, coalescing it with any refresh already pending.
+
+        :param guild:
+        :param fyi_info: an FYIRecord as returned by RaidFYIDB.get_fyi
+        :param guild_fyi_info: a dictionary as returned by RaidFYIDB.get_fyi_info
+        :param reconcile: True to rescan the FYI's reactions from its messages rather than using our record
+        :return:
+        """
+        key = self.fyi_key(fyi_info)
+        if key in self.fyi_refresh_requests:
+            reconcile = reconcile or self.fyi_refresh_requests[key][3]
+        self.fyi_refresh_requests[key] = (guild, fyi_info, guild_fyi_info, reconcile)
+        if key not in self.fyi_refresh_tasks:
+            self.fyi_refresh_tasks[key] = self.bot.loop.create_task(self.coalesced_fyi_refresh(key))
+
+    async def coalesced_fyi_refresh(self, key):
+        """
+        Wait out the refresh delay, then refresh the FYI using the most recently requested arguments.
+
+        Reaction changes recorded since the last refresh are written to the database first.  If another
+        refresh is requested while this one is running, run again afterward; a failed refresh is logged and
+        doesn't stop later ones from running.
+
+        As the reaction changes written by a failed refresh may have been lost, it is retried as a full reconcile
+        (rescanning the FYI's reactions from its messages).  If that keeps failing, we stop tracking the FYI's
+        reactions, so that the next reaction event on it requests a reconcile of its own.
+
+        :param key: a (chat channel ID, command message ID) pair
+        :return:
+        """
+        try:
+            while key in self.fyi_refresh_requests:
+                await asyncio.sleep(self.fyi_refresh_delay)
+                guild, fyi_info, guild_fyi_info, reconcile = self.fyi_refresh_requests.pop(key)
+                try:
+                    await self.refresh_fyi(key, guild, fyi_info, guild_fyi_info, reconcile)
+                except Exception:
+                    logger.exception(f"Could not refresh FYI {key} in guild {guild.id}")
+                    failures = self.fyi_refresh_failures.get(key, 0) + 1
+                    if failures < self.FYI_REFRESH_MAX_ATTEMPTS:
+                        self.fyi_refresh_failures[key] = failures
+                        self.request_fyi_refresh(guild, fyi_info, guild_fyi_info, reconcile=True)
+                    else:
+                        self.fyi_refresh_failures.pop(key, None)
+                        self.forget_fyi_reactions(fyi_info)
+                else:
+                    self.fyi_refresh_failures.pop(key, None)
+        finally:
+            self.fyi_refresh_tasks.pop(key, None)
+
+    async def refresh_fyi(self, key, guild, fyi_info, guild_fyi_info, reconcile):
+        """
+        Write the FYI's recorded reaction changes to the database (unless reconciling) and refresh its relay messages.
+
+        :param key: a (chat channel ID, command message ID) pair
+        :param guild:
+        :param fyi_info: an FYIRecord as returned by RaidFYIDB.get_fyi
+        :param guild_fyi_info: a dictionary as returned by RaidFYIDB.get_fyi_info
+        :param reconcile: True to rescan the FYI's reactions from its messages rather than using our record
+        :return:
+        """
+        changes = self.fyi_reaction_changes.pop(key, {})
+        if not reconcile and len(changes) > 0:
+            try:
+                await self.db.update_fyi_reactions(
+                    guild,
+                    fyi_info.chat_channel,
+                    fyi_info.command_message_id,
+                    added=[reaction for reaction, added in changes.items() if added],
+                    removed=[reaction for reaction, added in changes.items() if not added],
+                )
+            except ValueError:  # the FYI has been deleted
+                self.forget_fyi_reactions(fyi_info)
+                self.forget_fyi_messages(fyi_info)
+                return
         await self.update_fyi_helper(
             guild,
             fyi_info,
             guild_fyi_info["timezone"],
             guild_fyi_info["rsvp_emoji"],
             guild_fyi_info["remote_emoji"],
+            None if reconcile else self.fyi_reactions.get(key),
         )
 
     async def update_fyi_edited(self, payload):
@@ -700,16 +1111,18 @@ Cancelled emoji: {fyi_info["cancelled_emoji"] if fyi_info["enhanced"] else "(Non
         guild = edited_message_channel.guild
         if guild is None:
             return
-        guild_fyi_info = self.db.get_fyi_info(guild)
-        fyi_info = self.db.get_fyi(guild, edited_message_channel, payload.message_id)
+        if not self.db.might_be_active_fyi_message(guild.id, payload.message_id):
+            return
+        guild_fyi_info = await self.db.get_fyi_info(guild)
+        fyi_info = await self.db.get_fyi(guild, edited_message_channel, payload.message_id, projection="roster")
         # Do nothing if this isn't an active FYI, or if this is the relay message.
-        if guild_fyi_info is None or fyi_info is None or not fyi_info["active"]:
+        if guild_fyi_info is None or fyi_info is None or not fyi_info.active:
             return
 
         # Do nothing if this is a relay message (as this is edited by the bot).
-        if (edited_message_channel == fyi_info["relay_channel"] or
-                edited_message_channel == fyi_info["chat_channel"] and
-                payload.message_id == fyi_info["chat_relay_message_id"]):
+        if (edited_message_channel == fyi_info.relay_channel or
+                edited_message_channel == fyi_info.chat_channel and
+                payload.message_id == fyi_info.chat_relay_message_id):
             return
 
         relay_message_text, reactors = await self.update_fyi_helper(
@@ -718,30 +1131,35 @@ Cancelled emoji: {fyi_info["cancelled_emoji"] if fyi_info["enhanced"] else "(Non
             guild_fyi_info["timezone"],
             guild_fyi_info["rsvp_emoji"],
             guild_fyi_info["remote_emoji"],
+            self.fyi_reactions.get(self.fyi_key(fyi_info)),
         )
 
         if guild_fyi_info["enhanced"]:
             # Ping all interested.
-            audience = [x for x in reactors if x != fyi_info["creator"]]
+            audience = [x for x in reactors if x != fyi_info.creator]
             if len(audience) != 0:
                 audience_str = " ".join([self.mention_member_or_id(x) for x in audience])
                 # Inset the relay message text.
                 inset_relay_message_text = "> " + relay_message_text.replace("\n", "\n> ")
                 reactor_ping = (f"{audience_str} the FYI you were interested in has been updated "
-                                f"by {self.mention_member_or_id(fyi_info['creator'])}:\n"
+                                f"by {self.mention_member_or_id(fyi_info.creator)}:\n"
                                 f"{inset_relay_message_text}")
-                await fyi_info["chat_channel"].send(reactor_ping)
+                await fyi_info.chat_channel.send(reactor_ping)
 
     @Cog.listener()
     async def on_raw_reaction_add(self, payload):
-        await self.update_fyi_interested(payload)
+        await self.update_fyi_interested(payload, added=True)
 
     @Cog.listener()
     async def on_raw_reaction_remove(self, payload):
-        await self.update_fyi_interested(payload)
+        await self.update_fyi_interested(payload, added=False)
 
     @Cog.listener()
     async def on_raw_message_edit(self, payload):
+        # discord.py updates the messages in its own cache in place when they're edited; any other copy we've
+        # cached must be re-fetched to see its new content.
+        if payload.cached_message is None:
+            self.fyi_messages.discard(int(payload.data["channel_id"]), payload.message_id)
         await self.update_fyi_edited(payload)
 
     async def deactivate_fyi(
@@ -762,47 +1180,50 @@ Cancelled emoji: {fyi_info["cancelled_emoji"] if fyi_info["enhanced"] else "(Non
         :param cancellation: True if this is because the FYI was cancelled; False otherwise (i.e. it expired)
         :return:
         """
-        guild_fyi_info = self.db.get_fyi_info(guild)
-        fyi_info = self.db.get_fyi(guild, channel, message_id)
-        if guild_fyi_info is None or fyi_info is None or not fyi_info["active"]:
+        guild_fyi_info = await self.db.get_fyi_info(guild)
+        fyi_info = await self.db.get_fyi(guild, channel, message_id, projection="roster")
+        if guild_fyi_info is None or fyi_info is None or not fyi_info.active:
             return
 
         try:
-            command_message = await fyi_info["chat_channel"].fetch_message(fyi_info["command_message_id"])
+            command_message = await self.fyi_messages.fetch(fyi_info.chat_channel, fyi_info.command_message_id)
         except discord.errors.NotFound:
             command_message = None
 
         try:
-            relay_message = await fyi_info["relay_channel"].fetch_message(fyi_info["relay_message_id"])
+            relay_message = await self.fyi_messages.fetch(fyi_info.relay_channel, fyi_info.relay_message_id)
         except discord.errors.NotFound:
             relay_message = None
 
         chat_relay_message = None
-        if fyi_info["chat_relay_message_id"] is not None:
+        if fyi_info.chat_relay_message_id is not None:
             try:
-                chat_relay_message = await fyi_info["chat_channel"].fetch_message(fyi_info["chat_relay_message_id"])
+                chat_relay_message = await self.fyi_messages.fetch(
+                    fyi_info.chat_channel,
+                    fyi_info.chat_relay_message_id
+                )
             except discord.errors.NotFound:
                 chat_relay_message = None
 
         if cancellation:
             # Strike out any relay messages that are remaining.
-            for relay_message in [x for x in [relay_message, chat_relay_message] if x is not None]:
-                prior_content = relay_message.content
-                await relay_message.edit(content="~~{}~~".format(prior_content))
+            for message in [x for x in [relay_message, chat_relay_message] if x is not None]:
+                prior_content = self.pending_relay_content(message)
+                self.request_relay_edit(message, "~~{}~~".format(prior_content))
 
             # Add the guild's "cancelled" emoji to any messages that are remaining.
             for fyi_message in [x for x in [command_message, relay_message, chat_relay_message] if x is not None]:
                 await fyi_message.add_reaction(guild_fyi_info["cancelled_emoji"])
 
             # Send a ping to all who were interested.
-            audience = set(fyi_info["interested"] + [fyi_info["creator"]])
+            audience = set(fyi_info.interested + [fyi_info.creator])
             if len(audience) != 0:
                 audience_str = " ".join([self.mention_member_or_id(x) for x in audience])
-                clean_fyi_text = discord.utils.escape_mentions(fyi_info["edit_history"][-1])
+                clean_fyi_text = discord.utils.escape_mentions(fyi_info.latest_edit)
                 inset_fyi_text = "> " + clean_fyi_text.replace("\n", "\n> ")
                 deletion_ping = (f"{audience_str} the FYI you were interested in has been removed:\n"
                                  f"{inset_fyi_text}")
-                await fyi_info["chat_channel"].send(
+                await fyi_info.chat_channel.send(
                     deletion_ping,
                     allowed_mentions=discord.AllowedMentions(
                         everyone=False,
@@ -811,21 +1232,33 @@ Cancelled emoji: {fyi_info["cancelled_emoji"] if fyi_info["enhanced"] else "(Non
                     )
                 )
 
-        self.db.deactivate_fyi(guild, fyi_info["chat_channel"], fyi_info["command_message_id"])
+        await self.db.deactivate_fyi(
+            guild,
+            fyi_info.chat_channel,
+            fyi_info.command_message_id
+        )
+        self.forget_fyi_reactions(fyi_info)
+        self.forget_fyi_messages(fyi_info)
 
     @Cog.listener()
     async def on_raw_message_delete(self, payload):
+        self.fyi_messages.discard(payload.channel_id, payload.message_id)
+        if not self.db.might_be_active_fyi_message(payload.guild_id, payload.message_id):
+            return
         guild = self.bot.get_guild(payload.guild_id)
         channel = guild.get_channel(payload.channel_id)
         await self.deactivate_fyi(guild, channel, payload.message_id, cancellation=True)
 
     @Cog.listener()
     async def on_raw_bulk_message_delete(self, payload):
+        if not any(self.db.might_be_active_fyi_message(payload.guild_id, message_id)
+                   for message_id in payload.message_ids):
+            return
         guild = self.bot.get_guild(payload.guild_id)
         channel = guild.get_channel(payload.channel_id)
-        matching_fyis = self.db.look_for_fyis(guild, channel, payload.message_ids)
+        matching_fyis = await self.db.look_for_fyis(guild, channel, payload.message_ids)
         for fyi_info in matching_fyis:
-            await self.deactivate_fyi(guild, channel, fyi_info["command_message_id"], cancellation=False)
+            await self.deactivate_fyi(guild, channel, fyi_info.command_message_id, cancellation=False)
 
     def human_readable_member_or_id(self, member_or_id):
         """
@@ -846,50 +1279,37 @@ Cancelled emoji: {fyi_info["cancelled_emoji"] if fyi_info["enhanced"] else "(Non
 
     def serialize_fyi_info(self, fyi_info, human_readable=False):
         """
-        Convert a dictionary summarizing an FYI (as returned by RaidFYIDB.get_fyi) into something JSON-serializable.
+        Convert an FYIRecord (as returned by RaidFYIDB.get_fyi) into something JSON-serializable.
         :param fyi_info:
         :param human_readable:
         :return:
         """
-        fyi = {}
-
-        for key in fyi_info:
-            fyi[key] = fyi_info[key]
-
-        fyi["command_message_id"] = int(fyi["command_message_id"])
-        fyi["relay_message_id"] = int(fyi["relay_message_id"])
-        fyi["chat_relay_message_id"] = (int(fyi["chat_relay_message_id"])
-                                        if fyi["chat_relay_message_id"] is not None else None)
-        fyi["timestamp"] = fyi["timestamp"].isoformat()
-        fyi["expiry"] = fyi["expiry"].isoformat()
+        fyi = {
+            "command_message_id": fyi_info.command_message_id,
+            "relay_message_id": fyi_info.relay_message_id,
+            "chat_relay_message_id": fyi_info.chat_relay_message_id,
+            "timestamp": fyi_info.timestamp.isoformat(),
+            "expiry": fyi_info.expiry.isoformat(),
+            "edit_history": fyi_info.edit_history,
+            "reactions": sorted(fyi_info.reactions),
+            "active": fyi_info.active,
+            "expires_via_ttl": fyi_info.expires_via_ttl,
+        }
 
         if human_readable:
-            fyi["chat_channel"] = fyi["chat_channel"].name
-            fyi["relay_channel"] = fyi["relay_channel"].name
-            fyi["interested"] = [self.human_readable_member_or_id(x) for x in fyi["interested"]]
-            fyi["creator"] = self.human_readable_member_or_id(fyi["creator"])
+            fyi["chat_channel"] = fyi_info.chat_channel.name
+            fyi["relay_channel"] = fyi_info.relay_channel.name
+            fyi["interested"] = [self.human_readable_member_or_id(x) for x in fyi_info.interested]
+            fyi["creator"] = self.human_readable_member_or_id(fyi_info.creator)
         else:
-            fyi["chat_channel"] = fyi["chat_channel"].id
-            fyi["relay_channel"] = fyi["relay_channel"].id
-            fyi["interested"] = [x.id if isinstance(x, discord.Member) else int(x) for x in fyi["interested"]]
-            fyi["creator"] = fyi["creator"].id if isinstance(fyi["creator"], discord.Member) else int(fyi["creator"])
+            # No need to look up any members or channels here.
+            fyi["chat_channel"] = fyi_info.chat_channel_id
+            fyi["relay_channel"] = fyi_info.relay_channel_id
+            fyi["interested"] = list(fyi_info.interested_ids)
+            fyi["creator"] = fyi_info.creator_id
 
         return fyi
 
-    @staticmethod
-    def make_discord_file_from_json(fileify_me, filename):
-        """
-        Helper that takes a serializable Python object and converts it into a JSON discord.File object.
-
-        :param fileify_me:
-        :param filename:
-        :return:
-        """
-        return discord.File(
-            io.BytesIO(json.dumps(fileify_me, indent=4).encode("utf8")),
-            filename=filename
-        )
-
     @command(help="Show expired FYIs")
     async def get_inactive_fyis(self, ctx):
         """
@@ -897,56 +1317,62 @@ Cancelled emoji: {fyi_info["cancelled_emoji"] if fyi_info["enhanced"] else "(Non
         :param ctx:
         :return:
         """
-        self.can_configure_bot_validator(ctx)
-        inactive_fyis = self.db.get_inactive_fyis(ctx.guild)
+        await self.can_configure_bot_validator(ctx)
 
-        human_readable = []
-        machine_readable = []
-        for fyi in inactive_fyis:
+        human_readable = JSONArrayFile()
+        machine_readable = JSONArrayFile()
+        async for fyi in self.db.iterate_pages("get_inactive_fyis_page", ctx.guild):
             human_readable.append(self.serialize_fyi_info(fyi, True))
             machine_readable.append(self.serialize_fyi_info(fyi, False))
 
         reply = f"{ctx.author.mention} This guild has no inactive FYIs."
         jsons = None
-        if len(inactive_fyis) > 0:
+        if machine_readable.count > 0:
             reply = f"{ctx.author.mention} All of this guild's inactive FYIs:"
             jsons = [
-                self.make_discord_file_from_json(
-                    human_readable,
-                    "inactive_human_readable.json"
-                ),
-                self.make_discord_file_from_json(
-                    machine_readable,
-                    "inactive.json"
-                )
+                human_readable.to_discord_file("inactive_human_readable.json"),
+                machine_readable.to_discord_file("inactive.json")
             ]
         async with ctx.channel.typing():
             await ctx.channel.send(reply, files=jsons)
 
-    def get_expired_fyis_helper(self, guild: discord.Guild):
+    async def get_expired_fyis_helper(self, guild: discord.Guild, due_fyis=None, expired_after=None):
         """
         Helper to get all expired FYIs for this guild.
+
+        The FYIs are read a page at a time and serialized as they arrive; only the fields needed to delete
+        each one are kept.
         :param guild:
-        :return:
+        :param due_fyis: if specified, a list of FYIs (as returned by RaidFYIDB.get_fyi) already known to be
+        expired, which are used instead of querying for expired FYIs
+        :param expired_after: if specified, only FYIs that expired after this time, exclusive, are retrieved
+        :return: a tuple (message text, list of JSON files or None, list of expired FYIs' keys, expiry cutoff)
         """
         expired_by = datetime.now(timezone.utc)
-        expired_fyis = self.db.get_expired_fyis(guild, expired_by)
-        human_readable = [self.serialize_fyi_info(x, True) for x in expired_fyis]
-        machine_readable = [self.serialize_fyi_info(x, False) for x in expired_fyis]
+        human_readable = JSONArrayFile()
+        machine_readable = JSONArrayFile()
+        expired_fyis = []
+
+        def record_expired_fyi(fyi):
+            human_readable.append(self.serialize_fyi_info(fyi, True))
+            machine_readable.append(self.serialize_fyi_info(fyi, False))
+            expired_fyis.append(fyi.keys_only())
+
+        if due_fyis is not None:
+            for fyi in due_fyis:
+                record_expired_fyi(fyi)
+        else:
+            async for fyi in self.db.iterate_pages("get_expired_fyis_page", guild, expired_by,
+                                                   expired_after=expired_after):
+                record_expired_fyi(fyi)
 
         message_text = "There are no expired FYIs to clean up."
         jsons = None
         if len(expired_fyis) > 0:
             message_text = "The following FYIs are expired:"
             jsons = [
-                self.make_discord_file_from_json(
-                    human_readable,
-                    f"expired_{expired_by.isoformat()}_human_readable.json"
-                ),
-                self.make_discord_file_from_json(
-                    machine_readable,
-                    f"expired_{expired_by.isoformat()}.json"
-                )
+                human_readable.to_discord_file(f"expired_{expired_by.isoformat()}_human_readable.json"),
+                machine_readable.to_discord_file(f"expired_{expired_by.isoformat()}.json")
             ]
         return message_text, jsons, expired_fyis, expired_by
 
@@ -957,38 +1383,76 @@ Cancelled emoji: {fyi_info["cancelled_emoji"] if fyi_info["enhanced"] else "(Non
         :param ctx:
         :return:
         """
-        self.can_configure_bot_validator(ctx)
-        message_text, jsons, _, _ = self.get_expired_fyis_helper(ctx.guild)
+        await self.can_configure_bot_validator(ctx)
+        message_text, jsons, _, _ = await self.get_expired_fyis_helper(ctx.guild)
         reply = f"{ctx.author.mention} {message_text}"
         async with ctx.channel.typing():
             await ctx.channel.send(reply, files=jsons)
 
-    async def clean_up_fyis_helper(self, guild, message_coro, caller=None):
+    async def clean_up_fyis_helper(
+            self,
+            guild,
+            message_coro,
+            caller=None,
+            due_fyis=None,
+            leave_to_ttl=False,
+            single_message=False
+    ):
         """
         Helper for cleaning up FYIs.
         :param guild:
         :param message_coro:
         :param caller: a discord.Member or None
-        :return:
-        """
-        message_text, jsons, expired_fyis, _ = self.get_expired_fyis_helper(guild)
-        message_to_send = message_text if caller is None else f"{caller.mention} {message_text}"
-        if message_coro is not None:
+        :param due_fyis: if specified, clean up only these FYIs (see get_expired_fyis_helper)
+        :param leave_to_ttl: if True, FYIs that DynamoDB will delete via Time To Live are only logged and forgotten,
+        not deleted; and only FYIs that expired since this guild's last such clean-up are retrieved
+        :param single_message: if True, report the expired FYIs and the outcome in one message sent after the
+        clean-up (and nothing at all if there was nothing to clean up), rather than reporting progress as we go
+        :return: the number of FYIs cleaned up
+        """
+        expired_after = None
+        if leave_to_ttl and due_fyis is None:
+            expired_after = self.ttl_cleaned_up_through.get(guild.id)
+        message_text, jsons, expired_fyis, expired_by = await self.get_expired_fyis_helper(
+            guild,
+            due_fyis=due_fyis,
+            expired_after=expired_after
+        )
+        if message_coro is not None and not single_message:
+            message_to_send = message_text if caller is None else f"{caller.mention} {message_text}"
             await message_coro(message_to_send, files=jsons)
 
         if len(expired_fyis) > 0:
-            if message_coro is not None:
+            if message_coro is not None and not single_message:
                 await message_coro("Cleaning up...")
             # Now actually clean up the FYIs.
             try:
+                fyis_to_delete = expired_fyis
+                if leave_to_ttl:
+                    fyis_to_delete = [x for x in expired_fyis if not x.expires_via_ttl]
+                    self.db.forget_fyis(guild, [x for x in expired_fyis if x.expires_via_ttl])
+                await self.db.delete_fyis(guild, fyis_to_delete)
                 for fyi_info in expired_fyis:
-                    self.db.delete_fyi(guild, fyi_info["chat_channel"], fyi_info["command_message_id"])
-                if message_coro is not None:
-                    await message_coro("... done.")
-            except BotoCoreError as e:
+                    self.forget_fyi_reactions(fyi_info)
+                    self.forget_fyi_messages(fyi_info)
+            except (BotoCoreError, RuntimeError) as e:
                 if message_coro is not None:
-                    await message_coro(f"There was a database error while deleting these FYIs:\n{str(e)}")
+                    if single_message:
+                        await message_coro(
+                            f"There was a database error while cleaning up the following expired FYIs:\n{str(e)}",
+                            files=jsons
+                        )
+                    else:
+                        await message_coro(f"There was a database error while deleting these FYIs:\n{str(e)}")
                 raise
+            if message_coro is not None:
+                if single_message:
+                    await message_coro("The following expired FYIs were cleaned up:", files=jsons)
+                else:
+                    await message_coro("... done.")
+        if leave_to_ttl and due_fyis is None:
+            self.ttl_cleaned_up_through[guild.id] = expired_by
+        return len(expired_fyis)
 
     @command(help="Clean up expired and inactive FYIs.")
     async def clean_up_fyis(self, ctx):
@@ -996,26 +1460,142 @@ Cancelled emoji: {fyi_info["cancelled_emoji"] if fyi_info["enhanced"] else "(Non
         Clean up all expired and inactive FYIs for this guild.
         :return:
         """
-        self.can_configure_bot_validator(ctx)
+        await self.can_configure_bot_validator(ctx)
         await self.clean_up_fyis_helper(ctx.guild, ctx.channel.send, caller=ctx.author)
 
     @tasks.loop()  # set a proper loop interval at initialization
     async def clean_up_fyis_loop(self):
         """
         Background task that cleans up all expired and inactive FYIs.
+
+        Guilds are cleaned up concurrently, at most clean_up_concurrency at a time; a guild that fails or
+        runs out of time doesn't hold up or abort the others.
         :return:
         """
-        for guild in self.bot.guilds:
-            guild_logging_coro = None
-            if self.logging_cog is not None:
-                async def guild_logging_coro(*args, **kwargs):
-                    await self.logging_cog.log_to_channel(guild, *args, **kwargs)
-            await self.clean_up_fyis_helper(guild, guild_logging_coro, caller=None)
+        semaphore = asyncio.Semaphore(self.clean_up_concurrency)
+        sweep_start = time.monotonic()
+        all_stats = await asyncio.gather(*[self.clean_up_guild(guild, semaphore) for guild in self.bot.guilds])
+        logger.info(
+            f"Cleaned up {sum(stats['cleaned_up'] for stats in all_stats)} FYI(s) in {len(all_stats)} guild(s) "
+            f"in {time.monotonic() - sweep_start:.1f}s "
+            f"({sum(1 for stats in all_stats if stats['error'] is not None)} failure(s))"
+        )
+
+    async def clean_up_guild(self, guild, semaphore):
+        """
+        Clean up this guild's FYIs as part of the periodic sweep, and record how it went in clean_up_stats.
+
+        :param guild:
+        :param semaphore: limits the number of guilds being cleaned up at once
+        :return: the statistics recorded
+        """
+        guild_logging_coro = None
+        if self.logging_cog is not None:
+            async def guild_logging_coro(*args, **kwargs):
+                await self.logging_cog.log_to_channel(guild, *args, **kwargs)
+
+        async with semaphore:
+            start = time.monotonic()
+            cleaned_up = 0
+            error = None
+            try:
+                cleaned_up = await asyncio.wait_for(
+                    self.clean_up_fyis_helper(
+                        guild,
+                        guild_logging_coro,
+                        caller=None,
+                        leave_to_ttl=self.db.ttl_attribute is not None
+                    ),
+                    self.clean_up_guild_timeout
+                )
+            except asyncio.TimeoutError:
+                error = f"timed out after {self.clean_up_guild_timeout} seconds"
+                logger.warning(f"FYI clean-up for guild {guild.id} {error}")
+            except Exception as e:
+                error = str(e)
+                logger.exception(f"FYI clean-up for guild {guild.id} failed")
+            stats = {
+                "finished": datetime.now(timezone.utc),
+                "duration": time.monotonic() - start,
+                "cleaned_up": cleaned_up,
+                "error": error,
+            }
+        self.clean_up_stats[guild.id] = stats
+        return stats
 
     @clean_up_fyis_loop.before_loop
     async def before_clean_up_fyis(self):
         await self.bot.wait_until_ready()
 
+    # A guild whose due FYIs can't be cleaned up is retried after EXPIRY_RETRY_BASE_DELAY seconds, doubling with
+    # each consecutive failure up to EXPIRY_RETRY_MAX_DELAY.
+    EXPIRY_RETRY_BASE_DELAY = 30
+    EXPIRY_RETRY_MAX_DELAY = 3600
+
+    async def expiry_scheduler(self):
+        """
+        Background task that cleans up each FYI as soon as it expires.
+
+        The scheduler sleeps until the earliest expiry known to the database's expiry heap, and is woken
+        early whenever an FYI is added or a guild is indexed.  Nothing is read from the database until
+        some FYI is due.  If a guild's due FYIs can't be cleaned up (or the guild is unavailable), they are
+        put back on the heap to be retried later.
+        :return:
+        """
+        await self.bot.wait_until_ready()
+        while True:
+            self.expiry_wakeup.clear()
+            next_expiry = self.db.next_expiry()
+            now = datetime.now(timezone.utc)
+            if next_expiry is None or next_expiry > now:
+                timeout = None if next_expiry is None else (next_expiry - now).total_seconds()
+                try:
+                    await asyncio.wait_for(self.expiry_wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            due = self.db.pop_due_fyis(now)
+            for guild_id, originals in due.items():
+                guild = self.bot.get_guild(guild_id)
+                if guild is None:
+                    self.retry_expiries(guild_id, originals)
+                    continue
+                guild_logging_coro = None
+                if self.logging_cog is not None:
+                    async def guild_logging_coro(*args, **kwargs):
+                        await self.logging_cog.log_to_channel(guild, *args, **kwargs)
+                try:
+                    due_fyis = await self.db.get_fyis_by_key(guild, originals)
+                    if len(due_fyis) > 0:
+                        await self.clean_up_fyis_helper(
+                            guild,
+                            guild_logging_coro,
+                            due_fyis=due_fyis,
+                            leave_to_ttl=self.db.ttl_attribute is not None,
+                            single_message=True
+                        )
+                except Exception:
+                    logger.exception(f"Could not clean up expired FYIs for guild {guild_id}")
+                    self.retry_expiries(guild_id, originals)
+                else:
+                    self.expiry_failures.pop(guild_id, None)
+
+    def retry_expiries(self, guild_id, originals):
+        """
+        Put these due FYIs back on the expiry heap, to be cleaned up after a delay that grows with each failure.
+
+        :param guild_id:
+        :param originals: a list of (chat channel ID, command message ID) pairs, as returned by pop_due_fyis
+        :return:
+        """
+        failures = self.expiry_failures.get(guild_id, 0)
+        self.expiry_failures[guild_id] = failures + 1
+        delay = min(self.EXPIRY_RETRY_BASE_DELAY * 2 ** failures, self.EXPIRY_RETRY_MAX_DELAY)
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+        for chat_channel_id, command_message_id in originals:
+            self.db.schedule_expiry(guild_id, chat_channel_id, command_message_id, retry_at)
+
     async def cleanup_fc_messages(
         self,
         delay: int,
@@ -1069,17 +1649,10 @@ Cancelled emoji: {fyi_info["cancelled_emoji"] if fyi_info["enhanced"] else "(Non
         :param friend_code: the user's friend code
         :return:
         """
-        if (self.friend_code_server_headers["x-api-key"] is None
-                or self.friend_code_url_template is None):
+        if self.friend_code_client is None:
             return
 
-        resp = requests.put(
-            self.friend_code_url_template.format(ctx.author.id),
-            headers=self.friend_code_server_headers,
-            data=json.dumps({"friendCode": friend_code})
-        )
-
-        if resp.status_code == 200:
+        if await self.friend_code_client.set_friend_code(ctx.author.id, friend_code):
             bot_reply = await ctx.reply(
                 f"Your friend code will now appear in FYIs as {friend_code}.\n\n"
                 f"These messages will be deleted after {self.friend_code_cleanup_delay} seconds."
@@ -1134,16 +1707,10 @@ These messages will be deleted after {self.friend_code_cleanup_delay} seconds.
         :param ctx:
         :return:
         """
-        if (self.friend_code_server_headers["x-api-key"] is None
-                or self.friend_code_url_template is None):
+        if self.friend_code_client is None:
             return
 
-        resp = requests.delete(
-            self.friend_code_url_template.format(ctx.author.id),
-            headers=self.friend_code_server_headers,
-        )
-
-        if resp.status_code == 200:
+        if await self.friend_code_client.unset_friend_code(ctx.author.id):
             bot_reply = await ctx.reply(
                 f"Your friend code will no longer appear in FYIs.\n\n"
                 f"These messages will be deleted after {self.friend_code_cleanup_delay} seconds."
@@ -1170,17 +1737,12 @@ These messages will be deleted after {self.friend_code_cleanup_delay} seconds.
         :return:
         """
         # If we're configured for it, look for a friend code.
-        if (self.friend_code_server_headers["x-api-key"] is None
-                or self.friend_code_url_template is None):
+        if self.friend_code_client is None:
             return
 
-        resp = requests.get(
-            self.friend_code_url_template.format(ctx.author.id),
-            headers=self.friend_code_server_headers
-        )
-
-        if resp.status_code == 200:
-            bot_reply = await ctx.reply(f'{resp.json()["friendCode"]}')
+        friend_code = await self.friend_code_client.get_friend_code(ctx.author.id)
+        if friend_code is not None:
+            bot_reply = await ctx.reply(f'{friend_code}')
         else:
             bot_reply = await ctx.reply(
                 "Your friend code does not appear to be registered with the bot.  "
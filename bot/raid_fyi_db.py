@@ -1,14 +1,20 @@
+import heapq
 import re
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
 
 import dateutil
 import pytz
 
 import boto3
-from boto3.dynamodb.conditions import Key, Attr
+from boto3.dynamodb.conditions import Key
 import discord
 
 from bot.utils import emoji_to_db
 from bot.convert_using_guild import emoji_converter
+from bot.async_db import nonblocking
 
 
 # The schema of the database:
@@ -43,17 +49,115 @@ from bot.convert_using_guild import emoji_converter
 # - timestamp (datetime of the command -- only on original)
 # - expiry (datetime after which this FYI should be deactivated)
 # - edit_history (all of the edits made to this original post)
-# - interested (a list of member IDs, denoting all who are interested)
+# - latest_edit (the last entry of edit_history, so that updates can compare against it atomically)
+# - archived_edits (the number of the oldest edits moved out of edit_history into their own items; see below)
+# - reactions (a string set with an entry "[message ID]:[member ID]:[emoji]" for each reaction a member has
+#   added to any of this FYI's messages; absent if there are none)
+# - interested (a list of member IDs, denoting all who are interested; only on FYIs that predate "reactions")
 # - active (Boolean)
+# - active_expiry (a copy of expiry, present only while the FYI is active; the sort key of ActiveFYIsByExpiry)
+# - inactive_expiry (a copy of expiry, present only once the FYI is inactive; the sort key of InactiveFYIsByExpiry)
 
 # If this message is a relay:
 # - command_message (a (channel ID, message ID) pair pointing to the original command message -- only on relays)
 # - chat_or_relay (either "chat" or "relay", denotes which channel this one was posted in)
 
+# (guild[guild id], channel[channel id]#message[message id]#edit[n]), for an original whose edit history
+# is bounded (see RaidFYIDB.archive_edits):
+# - edit (the nth edit, counting from 0, of the original post)
+
+# If RaidFYIDB is given a ttl_attribute, both originals and relays written by add_fyi also have:
+# - [ttl_attribute] (the expiry as a Unix epoch number, for DynamoDB's Time To Live; see schema/raid_fyi_ttl.json)
+# as do any archived edits.
+
 chat_channel_pattern = "chatchannel(.+)"
 channel_message_template = "channel{}#message{}"
 channel_message_pattern = "channel([0-9]+)#message([0-9]+)"
+edit_archive_template = "channel{}#message{}#edit{}"
 category_pattern = "category(.+)"
+reaction_template = "{}:{}:{}"
+
+# The attributes read for an FYI, depending on what the caller needs it for.  Every projection includes
+# creator_id, which only originals have, and the attributes relays use to point at their original, so that
+# get_fyi_helper can tell the two apart and follow a relay.
+FYI_ROUTING_ATTRIBUTES = (
+    "config_channel_message",
+    "creator_id",
+    "chat_channel_id",
+    "command_message_id",
+    "relay_channel_id",
+    "relay_message_id",
+    "chat_relay_message_id",
+    "active",
+    "archived_edits",
+)
+# Enough to re-render an FYI's relay messages or ping its audience.
+FYI_ROSTER_ATTRIBUTES = FYI_ROUTING_ATTRIBUTES + (
+    "timestamp",
+    "expiry",
+    "latest_edit",
+    "reactions",
+    "interested",
+)
+# Everything, including the (potentially long) edit history; for exports.
+FYI_FULL_ATTRIBUTES = FYI_ROSTER_ATTRIBUTES + (
+    "edit_history",
+)
+FYI_PROJECTIONS = {
+    "routing": FYI_ROUTING_ATTRIBUTES,
+    "roster": FYI_ROSTER_ATTRIBUTES,
+    "full": FYI_FULL_ATTRIBUTES,
+}
+FYI_PAGE_SIZE = 100  # the most FYIs read from the FYIsByExpiry index in a single request
+
+BATCH_GET_MAX_KEYS = 100  # the most keys DynamoDB accepts in a single BatchGetItem request
+BATCH_WRITE_MAX_ITEMS = 25  # the most items DynamoDB accepts in a single BatchWriteItem request
+BATCH_RETRY_BASE_DELAY = 0.05  # seconds to wait before the first retry of unprocessed batch items
+BATCH_MAX_RETRIES = 8
+TRANSACT_MAX_ITEMS = 100  # the most actions DynamoDB accepts in a single TransactWriteItems request
+
+
+def parse_timestamp(timestamp_string):
+    """
+    Parse a timestamp stored on an FYI.
+
+    We store these with datetime.isoformat, so datetime.fromisoformat (which is much faster) handles
+    everything we write; anything else falls back to dateutil.
+
+    :param timestamp_string:
+    :return: a Python datetime object
+    """
+    try:
+        return datetime.fromisoformat(timestamp_string)
+    except ValueError:
+        return dateutil.parser.parse(timestamp_string)
+
+
+def parse_expiry(expiry_string):
+    """
+    Parse an FYI's stored expiry, treating a time with no timezone as UTC.
+
+    :param expiry_string:
+    :return: a timezone-aware Python datetime object
+    """
+    expiry = parse_timestamp(expiry_string)
+    if expiry.tzinfo is None:
+        expiry = expiry.replace(tzinfo=pytz.utc)
+    return expiry
+
+
+def reactions_by_member(reactions):
+    """
+    Collate a set of reaction entries (as stored in an FYI's "reactions") by member.
+
+    :param reactions: a set of strings produced by reaction_template
+    :return: a dictionary mapping member ID -|-> set of emoji (as strings) used by that member
+    """
+    by_member = defaultdict(set)
+    for reaction in reactions:
+        _, member_id, emoji = reaction.split(":", 2)
+        by_member[int(member_id)].add(emoji)
+    return by_member
 
 
 class MissingChannel(object):
@@ -74,19 +178,283 @@ class MissingCategory(MissingChannel):
         return f"[missing category {self.id}]"
 
 
+class FYIRecord(object):
+    """
+    A summary of an FYI, as returned by RaidFYIDB.get_fyi and friends.
+
+    The IDs of the FYI's channels, creator, and interested members are stored as ints; the corresponding
+    discord objects are only looked up when the properties that return them are used.
+    """
+    __slots__ = (
+        "guild",
+        "chat_channel_id",
+        "command_message_id",
+        "relay_channel_id",
+        "relay_message_id",
+        "chat_relay_message_id",
+        "creator_id",
+        "timestamp",
+        "expiry",
+        "edit_history",
+        "latest_edit",
+        "reactions",
+        "interested_ids",
+        "active",
+        "expires_via_ttl",
+        "archived_edits",
+    )
+
+    def __init__(
+            self,
+            guild: discord.Guild,
+            chat_channel_id: int,
+            command_message_id: int,
+            relay_channel_id: int,
+            relay_message_id: int,
+            chat_relay_message_id=None,
+            creator_id=None,
+            timestamp=None,
+            expiry=None,
+            edit_history=None,
+            latest_edit=None,
+            reactions=None,
+            interested_ids=None,
+            active=None,
+            expires_via_ttl=False,
+            archived_edits=0
+    ):
+        self.guild = guild
+        self.chat_channel_id = chat_channel_id
+        self.command_message_id = command_message_id
+        self.relay_channel_id = relay_channel_id
+        self.relay_message_id = relay_message_id
+        self.chat_relay_message_id = chat_relay_message_id  # may be None
+        self.creator_id = creator_id
+        self.timestamp = timestamp
+        self.expiry = expiry
+        self.edit_history = edit_history
+        self.latest_edit = latest_edit
+        self.reactions = reactions  # a set of reaction entries
+        self.interested_ids = interested_ids
+        self.active = active
+        self.expires_via_ttl = expires_via_ttl
+        self.archived_edits = archived_edits  # the number of edits stored in their own items
+
+    @classmethod
+    def from_item(cls, guild: discord.Guild, item, ttl_attribute=None):
+        """
+        Build a record from a raw database item for an original FYI.
+
+        Any attributes missing from the item (e.g. because the read projected them away) are left as None;
+        in particular, latest_edit is None for an FYI written before we recorded it, unless its edit history was
+        read.
+
+        :param guild:
+        :param item:
+        :param ttl_attribute: the name of the Time To Live attribute, if the database uses one
+        :return:
+        """
+        # In the below, we cast the numerical fields (which come back as Decimals) to ints.
+        chat_channel_id, command_message_id = re.match(
+            channel_message_pattern,
+            item["config_channel_message"]
+        ).groups()
+
+        reactions = None
+        interested_ids = None
+        if "reactions" in item or "interested" not in item:
+            reactions = set(item.get("reactions", set()))
+            interested_ids = sorted(reactions_by_member(reactions))
+        else:
+            reactions = set()
+            interested_ids = [int(person) for person in item["interested"]]
+
+        latest_edit = item.get("latest_edit")
+        if latest_edit is None and "edit_history" in item:
+            latest_edit = item["edit_history"][-1]
+
+        chat_relay_message_id = item.get("chat_relay_message_id")
+        return cls(
+            guild,
+            int(chat_channel_id),
+            int(command_message_id),
+            int(item["relay_channel_id"]) if "relay_channel_id" in item else None,
+            int(item["relay_message_id"]) if "relay_message_id" in item else None,
+            chat_relay_message_id=int(chat_relay_message_id) if chat_relay_message_id is not None else None,
+            creator_id=int(item["creator_id"]) if "creator_id" in item else None,
+            timestamp=parse_timestamp(item["timestamp"]) if "timestamp" in item else None,
+            expiry=parse_timestamp(item["expiry"]) if "expiry" in item else None,
+            edit_history=item.get("edit_history"),
+            latest_edit=latest_edit,
+            reactions=reactions,
+            interested_ids=interested_ids,
+            active=item.get("active"),
+            expires_via_ttl=ttl_attribute is not None and ttl_attribute in item,
+            archived_edits=int(item.get("archived_edits", 0))
+        )
+
+    def keys_only(self):
+        """
+        A copy of this record with only the IDs needed to locate (and delete) the FYI's items.
+
+        :return:
+        """
+        return FYIRecord(
+            self.guild,
+            self.chat_channel_id,
+            self.command_message_id,
+            self.relay_channel_id,
+            self.relay_message_id,
+            chat_relay_message_id=self.chat_relay_message_id,
+            expires_via_ttl=self.expires_via_ttl,
+            archived_edits=self.archived_edits
+        )
+
+    @property
+    def key(self):
+        """
+        (chat channel ID, command message ID), which identifies this FYI within its guild.
+
+        :return:
+        """
+        return self.chat_channel_id, self.command_message_id
+
+    def archived_edit_keys(self):
+        """
+        The sort keys of this FYI's archived edit items.
+
+        These are built from archived_edits, which archive_edits keeps exact by updating it in the same transaction
+        that writes the items, so no read is needed to find them.
+
+        :return: a list of config_channel_message values
+        """
+        return [
+            edit_archive_template.format(self.chat_channel_id, self.command_message_id, idx)
+            for idx in range(self.archived_edits)
+        ]
+
+    def resolve_channel(self, channel_id):
+        channel = self.guild.get_channel(channel_id)
+        if channel is None:
+            channel = MissingChannel(channel_id)
+        return channel
+
+    def resolve_member(self, member_id):
+        """
+        If the specified member is a current guild member, return the member; otherwise, return the raw ID.
+
+        :param member_id:
+        :return:
+        """
+        member = self.guild.get_member(member_id)
+        return member if member is not None else member_id
+
+    @property
+    def chat_channel(self):
+        return self.resolve_channel(self.chat_channel_id)
+
+    @property
+    def relay_channel(self):
+        return self.resolve_channel(self.relay_channel_id)
+
+    @property
+    def creator(self):
+        return self.resolve_member(self.creator_id)
+
+    @property
+    def interested(self):
+        return [self.resolve_member(x) for x in self.interested_ids]
+
+
 class RaidFYIDB(object):
     """
     A class representing the database we use to store our information.
+
+    Guild configurations returned by get_fyi_info are cached in-process; the methods of this class that
+    change a guild's configuration invalidate its entry, and entries expire after config_cache_ttl seconds
+    in case the configuration is changed by another process.
+
+    We also keep an in-process index of the IDs of all messages (command, relay, and chat relay) belonging
+    to active FYIs, so that events on any other message can be ignored without a database read, and so that
+    get_fyi can read the original FYI directly when given a relay message.  A guild's entries are loaded by
+    index_active_fyis and kept current by add_fyi, deactivate_fyi, and delete_fyi.
+
+    Likewise, the expiry times of all FYIs in indexed guilds are kept in a heap, so that a scheduler can
+    clean each one up when it expires without querying the database in the meantime (see next_expiry and
+    pop_due_fyis).
     """
-    def __init__(self, table_name="RaidFYI", *args, **kwargs):
+    def __init__(
+            self,
+            table_name="RaidFYI",
+            *args,
+            config_cache_ttl=300,
+            ttl_attribute=None,
+            edit_history_limit=None,
+            **kwargs
+    ):
         # The database can be initialized with raid_fyi_initialization.json.
         self.db = boto3.resource("dynamodb", *args, **kwargs)
         self.table = self.db.Table(table_name)
+        # If set, new FYIs are given this attribute so that DynamoDB deletes them once they expire;
+        # TTL must be enabled on the table with the same attribute name.
+        self.ttl_attribute = ttl_attribute
+        # If set, only this many of an FYI's most recent edits are kept in the original item; older ones
+        # are moved to their own items, so that frequently-edited FYIs don't grow without bound.
+        self.edit_history_limit = edit_history_limit
+        self.config_cache_ttl = config_cache_ttl
+        self.config_cache = {}  # maps guild ID -|-> (time cached, resolved configuration)
+        self.config_cache_versions = {}  # maps guild ID -|-> number of times its entry was invalidated
+        self.config_cache_lock = threading.Lock()
+        # Maps the ID of each message belonging to an active FYI in an indexed guild -|->
+        # (chat channel ID, command message ID) of the original.
+        self.active_fyi_messages = {}
+        self.indexed_guilds = set()  # IDs of guilds whose active FYIs have been loaded into the index
+        # Heap of (expiry, guild ID, chat channel ID, command message ID); entries whose FYI has since been
+        # deleted are left in the heap and skipped when they reach the top.
+        self.expiry_heap = []
+        self.scheduled_expiries = {}  # maps (guild ID, chat channel ID, command message ID) -|-> expiry
+        self.expiry_lock = threading.Lock()
+
+    @nonblocking
+    def invalidate_fyi_info(self, guild: discord.Guild):
+        """
+        Drop this guild's cached configuration so the next call to get_fyi_info reads it afresh.
+
+        :param guild:
+        :return:
+        """
+        with self.config_cache_lock:
+            self.config_cache.pop(guild.id, None)
+            self.config_cache_versions[guild.id] = self.config_cache_versions.get(guild.id, 0) + 1
 
     def get_fyi_info(self, guild: discord.Guild):
         """
         Return this guild's raid FYI configuration.
 
+        The result is shared between callers and must not be modified.
+
+        :param guild:
+        :return:
+        """
+        with self.config_cache_lock:
+            cached = self.config_cache.get(guild.id)
+            version = self.config_cache_versions.get(guild.id, 0)
+        if cached is not None:
+            cached_at, result = cached
+            if time.monotonic() - cached_at < self.config_cache_ttl:
+                return result
+
+        result = self.read_fyi_info(guild)
+        with self.config_cache_lock:
+            # Don't cache this if the configuration was changed while we were reading it.
+            if self.config_cache_versions.get(guild.id, 0) == version:
+                self.config_cache[guild.id] = (time.monotonic(), result)
+        return result
+
+    def read_fyi_info(self, guild: discord.Guild):
+        """
+        Read this guild's raid FYI configuration from the database, bypassing the cache.
+
         :param guild:
         :return:
         """
@@ -166,6 +534,154 @@ class RaidFYIDB(object):
         result["category_mappings"] = category_mappings
         return result
 
+    def index_active_fyis(self, guild: discord.Guild):
+        """
+        Load the message IDs of all of this guild's active FYIs into the index, and schedule all of its FYIs'
+        expiries.
+
+        The active FYIs are read from the sparse ActiveFYIsByExpiry index, and the inactive ones' expiries from
+        the keys of InactiveFYIsByExpiry.
+
+        :param guild:
+        :return:
+        """
+        message_ids = {}
+        expiries = []
+        for fyi_info in self.query_all_pages(
+                IndexName="ActiveFYIsByExpiry",
+                KeyConditionExpression=Key("guild_id").eq(guild.id),
+                ProjectionExpression="config_channel_message, relay_message_id, chat_relay_message_id, "
+                                     "active_expiry"
+        ):
+            chat_channel_id, command_message_id = re.match(
+                channel_message_pattern,
+                fyi_info["config_channel_message"]
+            ).groups()
+            original = (int(chat_channel_id), int(command_message_id))
+            expiries.append((parse_expiry(fyi_info["active_expiry"]), *original))
+            message_ids[original[1]] = original
+            message_ids[int(fyi_info["relay_message_id"])] = original
+            if fyi_info["chat_relay_message_id"] is not None:
+                message_ids[int(fyi_info["chat_relay_message_id"])] = original
+
+        for fyi_info in self.query_all_pages(
+                IndexName="InactiveFYIsByExpiry",
+                KeyConditionExpression=Key("guild_id").eq(guild.id),
+                ProjectionExpression="config_channel_message, inactive_expiry"
+        ):
+            chat_channel_id, command_message_id = re.match(
+                channel_message_pattern,
+                fyi_info["config_channel_message"]
+            ).groups()
+            expiries.append((parse_expiry(fyi_info["inactive_expiry"]), int(chat_channel_id), int(command_message_id)))
+
+        self.active_fyi_messages.update(message_ids)
+        for expiry, chat_channel_id, command_message_id in expiries:
+            self.schedule_expiry(guild.id, chat_channel_id, command_message_id, expiry)
+        self.indexed_guilds.add(guild.id)
+
+    def query_all_pages(self, **query_args):
+        """
+        Run this query on the table, following LastEvaluatedKey until all of the results have been read.
+
+        :param query_args: keyword arguments for Table.query
+        :return: a list of all of the items found
+        """
+        items = []
+        while True:
+            response = self.table.query(**query_args)
+            items.extend(response["Items"])
+            if "LastEvaluatedKey" not in response:
+                return items
+            query_args["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    @nonblocking
+    def schedule_expiry(self, guild_id, chat_channel_id, command_message_id, expiry):
+        """
+        Record when this FYI expires.
+
+        :param guild_id:
+        :param chat_channel_id:
+        :param command_message_id:
+        :param expiry: a timezone-aware Python datetime object
+        :return:
+        """
+        with self.expiry_lock:
+            self.scheduled_expiries[(guild_id, chat_channel_id, command_message_id)] = expiry
+            heapq.heappush(self.expiry_heap, (expiry, guild_id, chat_channel_id, command_message_id))
+
+    @nonblocking
+    def unschedule_expiry(self, guild_id, chat_channel_id, command_message_id):
+        """
+        Forget this FYI's expiry (e.g. because it has been deleted).
+
+        :param guild_id:
+        :param chat_channel_id:
+        :param command_message_id:
+        :return:
+        """
+        with self.expiry_lock:
+            self.scheduled_expiries.pop((guild_id, chat_channel_id, command_message_id), None)
+
+    def discard_stale_expiries(self):
+        """
+        Pop entries off the top of the expiry heap until the top one is current.
+
+        The caller must hold expiry_lock.
+
+        :return:
+        """
+        while len(self.expiry_heap) > 0:
+            expiry, *key = self.expiry_heap[0]
+            if self.scheduled_expiries.get(tuple(key)) == expiry:
+                return
+            heapq.heappop(self.expiry_heap)
+
+    @nonblocking
+    def next_expiry(self):
+        """
+        The earliest scheduled expiry, or None if there are none.
+
+        :return:
+        """
+        with self.expiry_lock:
+            self.discard_stale_expiries()
+            if len(self.expiry_heap) == 0:
+                return None
+            return self.expiry_heap[0][0]
+
+    @nonblocking
+    def pop_due_fyis(self, now):
+        """
+        Remove and return all FYIs whose expiry is before the specified time.
+
+        :param now: a timezone-aware Python datetime object
+        :return: a dictionary mapping guild ID -|-> list of (chat channel ID, command message ID) pairs
+        """
+        due = defaultdict(list)
+        with self.expiry_lock:
+            while True:
+                self.discard_stale_expiries()
+                if len(self.expiry_heap) == 0 or self.expiry_heap[0][0] >= now:
+                    break
+                _, guild_id, chat_channel_id, command_message_id = heapq.heappop(self.expiry_heap)
+                del self.scheduled_expiries[(guild_id, chat_channel_id, command_message_id)]
+                due[guild_id].append((chat_channel_id, command_message_id))
+        return due
+
+    @nonblocking
+    def might_be_active_fyi_message(self, guild_id, message_id):
+        """
+        False if this message certainly does not belong to an active FYI; True otherwise.
+
+        This does no I/O: if the guild's active FYIs have not been indexed yet, we can't rule anything out.
+
+        :param guild_id:
+        :param message_id:
+        :return:
+        """
+        return guild_id not in self.indexed_guilds or message_id in self.active_fyi_messages
+
     def configure_fyi(
             self,
             guild: discord.Guild,
@@ -203,6 +719,7 @@ class RaidFYIDB(object):
                 "timezone": tz_string
             }
         )
+        self.invalidate_fyi_info(guild)
 
     def deactivate_guild_fyi(self, guild: discord.Guild):
         """
@@ -217,6 +734,7 @@ class RaidFYIDB(object):
                 "config_channel_message": "config"
             }
         )
+        self.invalidate_fyi_info(guild)
 
     def activate_enhanced_fyi(
             self,
@@ -263,6 +781,7 @@ class RaidFYIDB(object):
                 ":relay_to_chat": relay_to_chat
             }
         )
+        self.invalidate_fyi_info(guild)
 
     def deactivate_enhanced_fyi(self, guild: discord.Guild):
         """
@@ -295,6 +814,7 @@ class RaidFYIDB(object):
                 ":relay_to_chat": None
             }
         )
+        self.invalidate_fyi_info(guild)
 
     def register_fyi_channel_mapping(
             self,
@@ -320,6 +840,7 @@ class RaidFYIDB(object):
                 "timeout_in_hours": timeout_in_hours
             }
         )
+        self.invalidate_fyi_info(guild)
 
     def register_fyi_category_mapping(
             self,
@@ -345,6 +866,7 @@ class RaidFYIDB(object):
                 "timeout_in_hours": timeout_in_hours
             }
         )
+        self.invalidate_fyi_info(guild)
 
     def get_fyi_category(
             self,
@@ -383,6 +905,7 @@ class RaidFYIDB(object):
                 "config_channel_message": "chatchannel{}".format(chat_channel.id)
             }
         )
+        self.invalidate_fyi_info(guild)
 
     def deregister_fyi_category_mapping(self, guild: discord.Guild, category: discord.CategoryChannel):
         """
@@ -398,6 +921,7 @@ class RaidFYIDB(object):
                 "config_channel_message": "category{}".format(category.id)
             }
         )
+        self.invalidate_fyi_info(guild)
 
     def deregister_all_fyi_channel_mappings(self, guild: discord.Guild):
         """
@@ -419,6 +943,7 @@ class RaidFYIDB(object):
                     "config_channel_message": raw_channel_mapping["config_channel_message"]
                 }
             )
+        self.invalidate_fyi_info(guild)
 
     def add_fyi(
             self,
@@ -434,7 +959,7 @@ class RaidFYIDB(object):
             chat_relay_message_id
     ):
         """
-        Create records for an FYI.
+        Create records for an FYI, and add its messages to the active FYI index.
 
         :param guild:
         :param creator:
@@ -446,11 +971,16 @@ class RaidFYIDB(object):
         :param relay_channel:
         :param relay_message_id:
         :param chat_relay_message_id:
-        :return:
+        :return: an FYIRecord describing the new FYI
         """
+        ttl = {}
+        if self.ttl_attribute is not None:
+            ttl[self.ttl_attribute] = int(expiry.timestamp())
+
         with self.table.batch_writer() as batch:
             batch.put_item(
                 Item={
+                    **ttl,
                     "guild_id": guild.id,
                     "config_channel_message": channel_message_template.format(chat_channel.id, command_message_id),
                     "creator_id": creator.id,
@@ -460,12 +990,14 @@ class RaidFYIDB(object):
                     "relay_message_id": relay_message_id,
                     "chat_relay_message_id": chat_relay_message_id,
                     "edit_history": [fyi_text],
-                    "interested": [],
-                    "active": True
+                    "latest_edit": fyi_text,
+                    "active": True,
+                    "active_expiry": expiry.isoformat()
                 }
             )
             batch.put_item(
                 Item={
+                    **ttl,
                     "guild_id": guild.id,
                     "config_channel_message": channel_message_template.format(relay_channel.id, relay_message_id),
                     "chat_channel_id": chat_channel.id,
@@ -476,6 +1008,7 @@ class RaidFYIDB(object):
             if chat_relay_message_id is not None:
                 batch.put_item(
                     Item={
+                        **ttl,
                         "guild_id": guild.id,
                         "config_channel_message": channel_message_template.format(chat_channel.id,
                                                                                   chat_relay_message_id),
@@ -484,16 +1017,56 @@ class RaidFYIDB(object):
                         "relay_or_chat": "chat"
                     }
                 )
+        for message_id in (command_message_id, relay_message_id, chat_relay_message_id):
+            if message_id is not None:
+                self.active_fyi_messages[message_id] = (chat_channel.id, command_message_id)
+        if guild.id in self.indexed_guilds:
+            self.schedule_expiry(guild.id, chat_channel.id, command_message_id, parse_expiry(expiry.isoformat()))
+
+        return FYIRecord(
+            guild,
+            chat_channel.id,
+            command_message_id,
+            relay_channel.id,
+            relay_message_id,
+            chat_relay_message_id=chat_relay_message_id,
+            creator_id=creator.id,
+            timestamp=timestamp,
+            expiry=expiry,
+            edit_history=[fyi_text],
+            latest_edit=fyi_text,
+            reactions=set(),
+            interested_ids=[],
+            active=True,
+            expires_via_ttl=self.ttl_attribute is not None
+        )
+
+    def projection_args(self, projection):
+        """
+        Keyword arguments that make a read return only the attributes of the specified projection.
+
+        :param projection: one of the keys of FYI_PROJECTIONS
+        :return:
+        """
+        attributes = FYI_PROJECTIONS[projection]
+        if self.ttl_attribute is not None:
+            attributes += (self.ttl_attribute,)
+        return {
+            "ProjectionExpression": ", ".join(f"#p{idx}" for idx in range(len(attributes))),
+            "ExpressionAttributeNames": {f"#p{idx}": x for idx, x in enumerate(attributes)},
+        }
 
     def get_fyi_helper(
             self,
             guild: discord.Guild,
-            fyi_info
+            fyi_info,
+            projection="full"
     ):
         """
-        Helper that produces a dictionary summarizing an FYI given a raw database result.
+        Helper that produces an FYIRecord summarizing an FYI given a raw database result.
         :param guild:
         :param fyi_info:
+        :param projection: the projection to use if this is a relay and the original must be read
         :return:
         """
         # Check if this is the command or the relay.
@@ -503,128 +1076,263 @@ class RaidFYIDB(object):
                     "guild_id": guild.id,
                     "config_channel_message": channel_message_template.format(fyi_info["chat_channel_id"],
                                                                               fyi_info["command_message_id"])
-                }
+                },
+                **self.projection_args(projection)
             )
             fyi_info = response.get("Item")
 
-        # In the below, we cast the numerical fields (which come back as Decimals)
-        # to ints.
-        chat_channel_id: int = int(
-            re.match(
-                channel_message_pattern,
-                fyi_info["config_channel_message"],
-            ).group(1)
-        )
-        chat_channel = guild.get_channel(chat_channel_id)
-        if chat_channel is None:
-            chat_channel = MissingChannel(chat_channel_id)
-        command_message_id = int(re.match(channel_message_pattern, fyi_info["config_channel_message"]).group(2))
-        relay_channel = guild.get_channel(int(fyi_info["relay_channel_id"]))
-        if relay_channel is None:
-            relay_channel = MissingChannel(int(fyi_info["relay_channel_id"]))
-        relay_message_id = int(fyi_info["relay_message_id"])
-
-        timestamp = dateutil.parser.parse(fyi_info["timestamp"])
-        expiry = dateutil.parser.parse(fyi_info["expiry"])
-
-        # If the creator is a current guild member, return the member; otherwise, return the raw ID.
-        creator = guild.get_member(int(fyi_info["creator_id"]))
-        if creator is None:
-            creator = int(fyi_info["creator_id"])
-
-        # Likewise for interested members.
-        interested = []
-        for x in [int(person) for person in fyi_info["interested"]]:
-            curr_interested = guild.get_member(x)
-            if curr_interested is None:
-                curr_interested = x
-            interested.append(curr_interested)
-
-        chat_relay_message_id = None
-        if fyi_info["chat_relay_message_id"] is not None:
-            chat_relay_message_id = int(fyi_info["chat_relay_message_id"])
-
-        return {
-            "chat_channel": chat_channel,
-            "command_message_id": command_message_id,
-            "relay_channel": relay_channel,
-            "relay_message_id": relay_message_id,
-            "chat_relay_message_id": chat_relay_message_id,
-            "timestamp": timestamp,
-            "expiry": expiry,
-            "creator": creator,
-            "edit_history": fyi_info["edit_history"],
-            "interested": interested,
-            "active": fyi_info["active"]
-        }
+        fyi_record = FYIRecord.from_item(guild, fyi_info, self.ttl_attribute)
+        if fyi_record.edit_history is not None and fyi_record.archived_edits > 0:
+            fyi_record.edit_history = (self.get_archived_edits(guild, *fyi_record.key) +
+                                       list(fyi_record.edit_history))
+        return fyi_record
 
     def get_fyi(
             self,
             guild: discord.Guild,
             channel: discord.TextChannel,
-            message_id
+            message_id,
+            projection="full"
     ):
         """
         Retrieve the information about this FYI based on the given channel and message ID.
 
-        These may be either the original command message or (either of) the relay message(s).
+        These may be either the original command message or (either of) the relay message(s).  If the message
+        belongs to an indexed active FYI, the original is read directly; otherwise, a relay message costs
+        a second read to follow it to the original.
 
         :param guild:
         :param channel:
         :param message_id:
+        :param projection: "routing" (only the FYI's IDs and status), "roster" (enough to re-render it; everything
+        but the edit history), or "full"
         :return:
         """
+        chat_channel_id, command_message_id = self.active_fyi_messages.get(message_id, (channel.id, message_id))
         response = self.table.get_item(
             Key={
                 "guild_id": guild.id,
-                "config_channel_message": channel_message_template.format(channel.id, message_id)
-            }
+                "config_channel_message": channel_message_template.format(chat_channel_id, command_message_id)
+            },
+            **self.projection_args(projection)
         )
         result = response.get("Item")
         if result is None:
             return
-        return self.get_fyi_helper(guild, result)
+        fyi_info = self.get_fyi_helper(guild, result, projection)
+        if projection == "roster" and fyi_info.latest_edit is None:
+            # This FYI predates latest_edit, so we need its edit history after all.
+            fyi_info = self.get_fyi(guild, fyi_info.chat_channel, fyi_info.command_message_id, projection="full")
+        return fyi_info
 
     def update_fyi(
             self,
             guild: discord.Guild,
             channel: discord.TextChannel,
             message_id,
-            new_fyi_text,
-            new_interested
+            new_fyi_text=None,
+            new_reactions=None
     ):
         """
-        Update this FYI based on the given channel and message ID.
+        Update this FYI based on the given channel and message ID, without reading it first.
 
         This message refers to the original (*not* (either of) the relay(s)).
 
+        The new text is appended to the edit history in the same conditional update, unless it is already the
+        latest edit (e.g. because a concurrent event recorded it first).
+
         :param guild:
         :param channel:
         :param message_id:
-        :param new_fyi_text:
-        :param new_interested:
+        :param new_fyi_text: the new text of the FYI, or None to leave the edit history as is
+        :param new_reactions: a set of reaction entries replacing the FYI's reactions, or None to leave them as is
+        :raises: ValueError if the FYI does not exist
         :return:
         """
-        # Retrieve the existing record to get at the edit history.
-        fyi_prior_to_update = self.get_fyi(guild, channel, message_id)
-        if fyi_prior_to_update is None:
-            raise ValueError("Could not find an FYI to update with guild {}, channel {}, message ID {}")
-        updated_edit_history = fyi_prior_to_update["edit_history"]
-        if updated_edit_history[-1] != new_fyi_text:
-            updated_edit_history.append(new_fyi_text)
+        set_clauses = []
+        remove_clauses = []
+        expression_attribute_values = {}
+        if new_reactions is not None:
+            # DynamoDB does not allow empty sets, so an FYI with no reactions has no "reactions" attribute.
+            if len(new_reactions) > 0:
+                set_clauses.append("reactions = :reactions")
+                expression_attribute_values[":reactions"] = set(new_reactions)
+            else:
+                remove_clauses.append("reactions")
+            remove_clauses.append("interested")
+
+        if new_fyi_text is None and new_reactions is None:
+            return
 
-        self.table.update_item(
-            Key={
-                "guild_id": guild.id,
-                "config_channel_message": channel_message_template.format(channel.id, message_id)
-            },
-            UpdateExpression="SET edit_history = :edit_history, "
-                             "interested = :interested",
-            ExpressionAttributeValues={
-                ":edit_history": updated_edit_history,
-                ":interested": new_interested
+        attempts = []
+        if new_fyi_text is not None:
+            attempts.append((
+                set_clauses + ["edit_history = list_append(edit_history, :new_edit)", "latest_edit = :new_fyi_text"],
+                dict(expression_attribute_values, **{":new_edit": [new_fyi_text], ":new_fyi_text": new_fyi_text}),
+                "attribute_exists(creator_id) AND "
+                "(attribute_not_exists(latest_edit) OR latest_edit <> :new_fyi_text)",
+                True
+            ))
+        if len(set_clauses) > 0 or len(remove_clauses) > 0:
+            attempts.append((set_clauses, expression_attribute_values, "attribute_exists(creator_id)", False))
+
+        for attempt_set_clauses, attempt_values, condition, records_text in attempts:
+            update_expression = ""
+            if len(attempt_set_clauses) > 0:
+                update_expression += "SET " + ", ".join(attempt_set_clauses)
+            if len(remove_clauses) > 0:
+                update_expression += " REMOVE " + ", ".join(remove_clauses)
+            update_args = {}
+            if len(attempt_values) > 0:
+                update_args["ExpressionAttributeValues"] = attempt_values
+            if records_text and self.edit_history_limit is not None:
+                update_args["ReturnValues"] = "ALL_NEW"
+            if records_text:
+                # If the condition fails, this tells us whether the FYI exists at all.
+                update_args["ReturnValuesOnConditionCheckFailure"] = "ALL_OLD"
+            try:
+                response = self.table.update_item(
+                    Key={
+                        "guild_id": guild.id,
+                        "config_channel_message": channel_message_template.format(channel.id, message_id)
+                    },
+                    UpdateExpression=update_expression.strip(),
+                    ConditionExpression=condition,
+                    **update_args
+                )
+                if "ReturnValues" in update_args:
+                    self.archive_edits(guild, channel.id, message_id, response["Attributes"])
+                return
+            except self.db.meta.client.exceptions.ConditionalCheckFailedException as e:
+                if records_text and "Item" in e.response:
+                    # The text was already the latest edit, so retry without it (if anything else is to change).
+                    continue
+                raise ValueError(f"Could not find an FYI to update with guild {guild}, "
+                                 f"channel {channel}, message ID {message_id}")
+
+    def archive_edits(self, guild: discord.Guild, chat_channel_id, command_message_id, fyi_info):
+        """
+        Move all but the last edit_history_limit entries of this FYI's edit history to their own items.
+
+        Each archived edit is stored under its position in the complete history.  The archive items are written
+        in the same transaction as the conditional trim of the inline history, so if two updates race, the
+        loser writes nothing at all (and at most TRANSACT_MAX_ITEMS - 1 edits are moved at a time).
+
+        :param guild:
+        :param chat_channel_id:
+        :param command_message_id:
+        :param fyi_info: the raw item of the original FYI as it is now
+        :return:
+        """
+        edit_history = fyi_info["edit_history"]
+        overflow = len(edit_history) - self.edit_history_limit
+        if overflow <= 0:
+            return
+        overflow = min(overflow, TRANSACT_MAX_ITEMS - 1)
+        archived_edits = int(fyi_info.get("archived_edits", 0))
+
+        ttl = {}
+        if self.ttl_attribute is not None and self.ttl_attribute in fyi_info:
+            ttl[self.ttl_attribute] = fyi_info[self.ttl_attribute]
+        # The resource's client serializes the attribute values of these actions itself.
+        actions = []
+        for idx, edit in enumerate(edit_history[:overflow], start=archived_edits):
+            actions.append({
+                "Put": {
+                    "TableName": self.table.name,
+                    "Item": {
+                        **ttl,
+                        "guild_id": guild.id,
+                        "config_channel_message": edit_archive_template.format(chat_channel_id, command_message_id,
+                                                                               idx),
+                        "edit": edit
+                    }
+                }
+            })
+
+        condition = "archived_edits = :old_archived_edits"
+        if archived_edits == 0:
+            condition = "attribute_not_exists(archived_edits) OR " + condition
+        actions.append({
+            "Update": {
+                "TableName": self.table.name,
+                "Key": {
+                    "guild_id": guild.id,
+                    "config_channel_message": channel_message_template.format(chat_channel_id, command_message_id)
+                },
+                "UpdateExpression": ("SET archived_edits = :new_archived_edits REMOVE " +
+                                     ", ".join(f"edit_history[{idx}]" for idx in range(overflow))),
+                "ConditionExpression": condition,
+                "ExpressionAttributeValues": {
+                    ":new_archived_edits": archived_edits + overflow,
+                    ":old_archived_edits": archived_edits
+                }
             }
+        })
+        try:
+            self.db.meta.client.transact_write_items(TransactItems=actions)
+        except self.db.meta.client.exceptions.TransactionCanceledException:
+            pass  # another update already trimmed these entries (or is doing so); the next update will catch up
+
+    def get_archived_edits(self, guild: discord.Guild, chat_channel_id, command_message_id):
+        """
+        Read the edits that archive_edits moved out of this FYI's inline edit history, oldest first.
+
+        :param guild:
+        :param chat_channel_id:
+        :param command_message_id:
+        :return:
+        """
+        items = self.query_all_pages(
+            KeyConditionExpression=(
+                Key("guild_id").eq(guild.id) &
+                Key("config_channel_message").begins_with(
+                    edit_archive_template.format(chat_channel_id, command_message_id, "")
+                )
+            )
         )
+        items.sort(key=lambda item: int(item["config_channel_message"].rsplit("#edit", 1)[1]))
+        return [item["edit"] for item in items]
+
+    def update_fyi_reactions(
+            self,
+            guild: discord.Guild,
+            channel: discord.TextChannel,
+            message_id,
+            added,
+            removed
+    ):
+        """
+        Add and remove individual reaction entries on this FYI without rewriting the rest of its reactions.
+
+        This message refers to the original (*not* (either of) the relay(s)).
+
+        :param guild:
+        :param channel:
+        :param message_id:
+        :param added: reaction entries (as produced by reaction_template) to add
+        :param removed: reaction entries to remove
+        :raises: ValueError if the FYI does not exist
+        :return:
+        """
+        key = {
+            "guild_id": guild.id,
+            "config_channel_message": channel_message_template.format(channel.id, message_id)
+        }
+        # ADD and DELETE may not act on the same attribute in a single update.
+        for operation, entries in (("ADD", added), ("DELETE", removed)):
+            if len(entries) == 0:
+                continue
+            try:
+                self.table.update_item(
+                    Key=key,
+                    UpdateExpression=f"{operation} reactions :entries",
+                    ConditionExpression="attribute_exists(creator_id)",
+                    ExpressionAttributeValues={":entries": set(entries)}
+                )
+            except self.db.meta.client.exceptions.ConditionalCheckFailedException:
+                raise ValueError(f"Could not find an FYI to update with guild {guild}, "
+                                 f"channel {channel}, message ID {message_id}")
 
     def deactivate_fyi(
             self,
@@ -633,86 +1341,269 @@ class RaidFYIDB(object):
             message_id
     ):
         """
-        Mark this FYI as cancelled.
+        Mark this FYI as cancelled, and remove its messages from the active FYI index.
 
         This message refers to the original (*not* (either of) the relay(s)).
 
         :param guild:
         :param channel:
         :param message_id:
+        :raises: ValueError if the FYI does not exist
         :return:
         """
-        # Retrieve the existing record to get at the edit history.
-        fyi_prior_to_update = self.get_fyi(guild, channel, message_id)
-        if fyi_prior_to_update is None:
-            raise ValueError("Could not find an FYI to cancel with guild {}, channel {}, message ID {}")
+        try:
+            response = self.table.update_item(
+                Key={
+                    "guild_id": guild.id,
+                    "config_channel_message": channel_message_template.format(channel.id, message_id)
+                },
+                UpdateExpression="SET active = :active, inactive_expiry = expiry REMOVE active_expiry",
+                ConditionExpression="attribute_exists(creator_id)",
+                ExpressionAttributeValues={
+                    ":active": False
+                },
+                ReturnValues="ALL_NEW"
+            )
+        except self.db.meta.client.exceptions.ConditionalCheckFailedException:
+            raise ValueError(f"Could not find an FYI to cancel with guild {guild}, "
+                             f"channel {channel}, message ID {message_id}")
 
-        self.table.update_item(
-            Key={
-                "guild_id": guild.id,
-                "config_channel_message": channel_message_template.format(channel.id, message_id)
-            },
-            UpdateExpression="SET active = :active",
-            ExpressionAttributeValues={
-                ":active": False
-            }
-        )
+        fyi_info = response["Attributes"]
+        self.unindex_fyi(message_id, fyi_info["relay_message_id"], fyi_info["chat_relay_message_id"])
 
     def delete_fyi(
             self,
             guild: discord.Guild,
             channel: discord.TextChannel,
-            message_id
+            message_id,
+            fyi_info=None
     ):
         """
-        Delete the FYI based on the given channel and message ID.
+        Delete the FYI based on the given channel and message ID, and remove its messages from the active FYI index.
 
         These may be either the original command message or the relay message.
 
         :param guild:
         :param channel:
         :param message_id:
+        :param fyi_info: the FYI as already returned by get_fyi, if the caller has it; otherwise it is read here
         :return:
         """
-        result = self.get_fyi(guild, channel, message_id)
+        result = fyi_info
+        if result is None:
+            result = self.get_fyi(guild, channel, message_id, projection="routing")
         if result is None:
             raise ValueError(f"Could not find an FYI to delete with guild {guild}, "
                              f"channel {channel}, message ID {message_id}")
 
-        # Check if this is the command or the relay.
-        if "creator_id" not in result:
-            result = self.get_fyi(guild, result["chat_channel"], result["command_message_id"])
-            if result is None:
-                raise ValueError(f"Could not find the original FYI attached to guild {guild}, "
-                                 f"channel {channel}, message ID {message_id}")
-
-        chat_channel = result["chat_channel"]
-        command_message_id = result["command_message_id"]
-        relay_channel = result["relay_channel"]
-        relay_message_id = result["relay_message_id"]
-        chat_relay_message_id = result["chat_relay_message_id"]
+        # get_fyi always resolves a relay to its original, so result describes the original here.
+        chat_channel_id = result.chat_channel_id
+        command_message_id = result.command_message_id
+        relay_channel_id = result.relay_channel_id
+        relay_message_id = result.relay_message_id
+        chat_relay_message_id = result.chat_relay_message_id
 
         with self.table.batch_writer() as batch:
             batch.delete_item(
                 Key={
                     "guild_id": guild.id,
-                    "config_channel_message": channel_message_template.format(chat_channel.id, command_message_id)
+                    "config_channel_message": channel_message_template.format(chat_channel_id, command_message_id)
                 }
             )
             batch.delete_item(
                 Key={
                     "guild_id": guild.id,
-                    "config_channel_message": channel_message_template.format(relay_channel.id, relay_message_id)
+                    "config_channel_message": channel_message_template.format(relay_channel_id, relay_message_id)
                 }
             )
             if chat_relay_message_id is not None:
                 batch.delete_item(
                     Key={
                         "guild_id": guild.id,
-                        "config_channel_message": channel_message_template.format(chat_channel.id,
+                        "config_channel_message": channel_message_template.format(chat_channel_id,
                                                                                   chat_relay_message_id)
                     }
                 )
+            for config_channel_message in result.archived_edit_keys():
+                batch.delete_item(
+                    Key={
+                        "guild_id": guild.id,
+                        "config_channel_message": config_channel_message
+                    }
+                )
+        self.unindex_fyi(command_message_id, relay_message_id, chat_relay_message_id)
+        self.unschedule_expiry(guild.id, chat_channel_id, command_message_id)
+
+    def delete_fyis(self, guild: discord.Guild, fyis):
+        """
+        Delete all of these FYIs, and remove their messages from the active FYI index.
+
+        The keys of each FYI's message and archived edit items are derived from the given records, so nothing is
+        read.  Items are deleted BATCH_WRITE_MAX_ITEMS at a time, and items that DynamoDB leaves unprocessed are
+        retried with exponential backoff.
+
+        :param guild:
+        :param fyis: FYIRecords (at least with their IDs and archived_edits, as produced by FYIRecord.keys_only)
+        :raises: RuntimeError if some items remain unprocessed after BATCH_MAX_RETRIES retries
+        :return:
+        """
+        config_channel_messages = []
+        for fyi_info in fyis:
+            config_channel_messages.append(
+                channel_message_template.format(fyi_info.chat_channel_id, fyi_info.command_message_id)
+            )
+            config_channel_messages.append(
+                channel_message_template.format(fyi_info.relay_channel_id, fyi_info.relay_message_id)
+            )
+            if fyi_info.chat_relay_message_id is not None:
+                config_channel_messages.append(
+                    channel_message_template.format(fyi_info.chat_channel_id, fyi_info.chat_relay_message_id)
+                )
+            config_channel_messages.extend(fyi_info.archived_edit_keys())
+
+        for start in range(0, len(config_channel_messages), BATCH_WRITE_MAX_ITEMS):
+            request_items = {
+                self.table.name: [
+                    {"DeleteRequest": {"Key": {"guild_id": guild.id, "config_channel_message": x}}}
+                    for x in config_channel_messages[start:start + BATCH_WRITE_MAX_ITEMS]
+                ]
+            }
+            retries = 0
+            while True:
+                response = self.db.batch_write_item(RequestItems=request_items)
+                request_items = response.get("UnprocessedItems")
+                if not request_items:
+                    break
+                if retries >= BATCH_MAX_RETRIES:
+                    raise RuntimeError(f"Could not delete all of the requested items from {self.table.name}")
+                time.sleep(BATCH_RETRY_BASE_DELAY * 2 ** retries)
+                retries += 1
+
+        self.forget_fyis(guild, fyis)
+
+    @nonblocking
+    def forget_fyis(self, guild: discord.Guild, fyis):
+        """
+        Remove these FYIs from the active FYI index and the expiry heap, without touching the database.
+
+        This is for FYIs that are being deleted, either by us or by DynamoDB's Time To Live.
+
+        :param guild:
+        :param fyis: FYIRecords as accepted by delete_fyis
+        :return:
+        """
+        for fyi_info in fyis:
+            self.unindex_fyi(fyi_info.command_message_id, fyi_info.relay_message_id, fyi_info.chat_relay_message_id)
+            self.unschedule_expiry(guild.id, fyi_info.chat_channel_id, fyi_info.command_message_id)
+
+    def unindex_fyi(self, command_message_id, relay_message_id, chat_relay_message_id):
+        """
+        Remove this FYI's messages from the active FYI index.
+
+        :param command_message_id:
+        :param relay_message_id:
+        :param chat_relay_message_id: may be None
+        :return:
+        """
+        for message_id in (command_message_id, relay_message_id, chat_relay_message_id):
+            if message_id is not None:
+                self.active_fyi_messages.pop(int(message_id), None)
+
+    def query_fyis_by_expiry_page(
+            self,
+            guild: discord.Guild,
+            key_condition,
+            filter_expression=None,
+            exclusive_start_key=None,
+            index_name="FYIsByExpiry"
+    ):
+        """
+        Read one page of this guild's FYIs from one of the indices sorted by expiry.
+
+        The full projection is read, as these are used for exports.  Only original FYIs have an expiry, so every
+        item in these indices is an original and get_fyi_helper never has to follow a relay.
+
+        :param guild:
+        :param key_condition: a condition on the index's keys, which must include Key("guild_id").eq(guild.id)
+        :param filter_expression: an optional boto3 condition applied to the items read
+        :param index_name: FYIsByExpiry, or the sparse index InactiveFYIsByExpiry; both project all attributes.
+        ActiveFYIsByExpiry can't be used here, as it only projects the few attributes needed by index_active_fyis,
+        so the full projection can't be read from it
+        :param exclusive_start_key: the key returned with the previous page, or None to start at the beginning
+        :return: a pair (list of FYIRecords, key of the next page or None)
+        """
+        query_args = {
+            "IndexName": index_name,
+            "KeyConditionExpression": key_condition,
+            **self.projection_args("full"),
+            "Limit": FYI_PAGE_SIZE,
+        }
+        if filter_expression is not None:
+            query_args["FilterExpression"] = filter_expression
+        if exclusive_start_key is not None:
+            query_args["ExclusiveStartKey"] = exclusive_start_key
+        response = self.table.query(**query_args)
+        fyis = [self.get_fyi_helper(guild, fyi_info) for fyi_info in response["Items"]]
+        return fyis, response.get("LastEvaluatedKey")
+
+    def get_expired_fyis_page(self, guild: discord.Guild, expired_by, exclusive_start_key=None, expired_after=None):
+        """
+        Retrieve one page of the FYIs expired prior to the specified timestamp, exclusive.
+
+        :param guild:
+        :param expired_by: a Python datetime object **in UTC**
+        :param exclusive_start_key: the key returned with the previous page, or None to start at the beginning
+        :param expired_after: if specified, a Python datetime object **in UTC**; only FYIs that expired after this
+        time, exclusive, and at or before expired_by, inclusive, are retrieved, so that consecutive calls passing
+        the previous expired_by as expired_after retrieve each FYI exactly once
+        :return: a pair (list of FYIs, key of the next page or None)
+        """
+        expiry_condition = Key("expiry").lt(expired_by.isoformat())
+        if expired_after is not None:
+            # "between" includes both ends, and expiry is the index's sort key, so it can't be filtered on; instead
+            # we start just past expired_after (expiries are stored no more precisely than this).
+            expiry_condition = Key("expiry").between(
+                (expired_after + timedelta(microseconds=1)).isoformat(),
+                expired_by.isoformat()
+            )
+        return self.query_fyis_by_expiry_page(
+            guild,
+            Key("guild_id").eq(guild.id) & expiry_condition,
+            exclusive_start_key=exclusive_start_key
+        )
+
+    def get_inactive_fyis_page(self, guild: discord.Guild, exclusive_start_key=None):
+        """
+        Retrieve one page of the inactive FYIs.
+
+        These are read from the sparse InactiveFYIsByExpiry index, so active FYIs are never read.
+
+        :param guild:
+        :param exclusive_start_key: the key returned with the previous page, or None to start at the beginning
+        :return: a pair (list of FYIs, key of the next page or None)
+        """
+        return self.query_fyis_by_expiry_page(
+            guild,
+            Key("guild_id").eq(guild.id),
+            exclusive_start_key=exclusive_start_key,
+            index_name="InactiveFYIsByExpiry"
+        )
+
+    @staticmethod
+    def all_pages(page_method, *args, **kwargs):
+        """
+        Call a paged method (e.g. get_expired_fyis_page) until it runs out of pages, and gather the results.
+
+        :param page_method:
+        :return:
+        """
+        results = []
+        next_key = None
+        while True:
+            page, next_key = page_method(*args, exclusive_start_key=next_key, **kwargs)
+            results.extend(page)
+            if next_key is None:
+                return results
 
     def get_expired_fyis(self, guild: discord.Guild, expired_by):
         """
@@ -722,62 +1613,100 @@ class RaidFYIDB(object):
         :param expired_by: a Python datetime object **in UTC**
         :return:
         """
-        response = self.table.query(
-            IndexName="FYIsByExpiry",
-            KeyConditionExpression=Key("guild_id").eq(guild.id) & Key("expiry").lt(expired_by.isoformat())
-        )
-        expired_fyis = []
-        for fyi_info in response["Items"]:
-            expired_fyis.append(self.get_fyi_helper(guild, fyi_info))
-        return expired_fyis
+        return self.all_pages(self.get_expired_fyis_page, guild, expired_by)
 
     def get_inactive_fyis(self, guild: discord.Guild):
         """
-        Retrieve data on all FYIs prior to the specified timestamp, inclusive.
+        Retrieve data on all inactive FYIs.
 
         :param guild:
-        :param expired_by: a Python datetime object **in UTC**
         :return:
         """
-        response = self.table.query(
-            IndexName="FYIsByExpiry",
-            KeyConditionExpression=Key("guild_id").eq(guild.id),
-            FilterExpression=Attr("active").eq(False)
-        )
-        inactive_fyis = []
-        for fyi_info in response["Items"]:
-            inactive_fyis.append(self.get_fyi_helper(guild, fyi_info))
-        return inactive_fyis
+        return self.all_pages(self.get_inactive_fyis_page, guild)
+
+    def batch_get_items(self, keys, projection=None):
+        """
+        Read all of the items with the given keys, BATCH_GET_MAX_KEYS at a time.
+
+        Keys that DynamoDB leaves unprocessed (e.g. due to throttling) are retried with exponential backoff.
+
+        :param keys: a list of dictionaries, each with "guild_id" and "config_channel_message"
+        :param projection: one of the keys of FYI_PROJECTIONS, or None to read whole items
+        :raises: RuntimeError if some keys remain unprocessed after BATCH_MAX_RETRIES retries
+        :return: a list of the items found; keys with no item are omitted
+        """
+        items = []
+        for start in range(0, len(keys), BATCH_GET_MAX_KEYS):
+            request_items = {self.table.name: {"Keys": keys[start:start + BATCH_GET_MAX_KEYS]}}
+            if projection is not None:
+                request_items[self.table.name].update(self.projection_args(projection))
+            retries = 0
+            while True:
+                response = self.db.batch_get_item(RequestItems=request_items)
+                items.extend(response["Responses"].get(self.table.name, []))
+                request_items = response.get("UnprocessedKeys")
+                if not request_items:
+                    break
+                if retries >= BATCH_MAX_RETRIES:
+                    raise RuntimeError(f"Could not read all of the requested items from {self.table.name}")
+                time.sleep(BATCH_RETRY_BASE_DELAY * 2 ** retries)
+                retries += 1
+        return items
 
     def look_for_fyis(
             self,
             guild: discord.Guild,
             channel: discord.TextChannel,
-            message_ids
+            message_ids,
+            projection="routing"
     ):
         """
         Look for FYIs corresponding to any of the given message IDs.
 
-        These may be either the original command message or (either of) the relay message(s).
+        These may be either the original command message or (either of) the relay message(s).  Only the
+        exact keys of the given messages are read, followed by the originals of any relays found; each FYI
+        is returned at most once.
 
         :param guild:
         :param channel:
         :param message_ids:
+        :param projection: see get_fyi
         :return:
         """
-        hash_key_condition = Key("config_channel_message").begins_with(
-            channel_message_template.format(channel.id, "")
-        )
-        response = self.table.query(
-            KeyConditionExpression=Key("guild_id").eq(guild.id) & hash_key_condition
-        )
-        if response["Items"] is None:
-            return []
+        keys = [
+            {"guild_id": guild.id, "config_channel_message": channel_message_template.format(channel.id, x)}
+            for x in set(message_ids)
+        ]
+        originals = {}  # maps config_channel_message -|-> raw item
+        relay_targets = set()
+        for fyi_info in self.batch_get_items(keys, projection):
+            if "creator_id" in fyi_info:
+                originals[fyi_info["config_channel_message"]] = fyi_info
+            else:
+                relay_targets.add(channel_message_template.format(int(fyi_info["chat_channel_id"]),
+                                                                  int(fyi_info["command_message_id"])))
+
+        missing_originals = [
+            {"guild_id": guild.id, "config_channel_message": x} for x in relay_targets if x not in originals
+        ]
+        for fyi_info in self.batch_get_items(missing_originals, projection):
+            originals[fyi_info["config_channel_message"]] = fyi_info
+
+        return [self.get_fyi_helper(guild, fyi_info) for fyi_info in originals.values()]
+
+    def get_fyis_by_key(self, guild: discord.Guild, originals, projection="full"):
+        """
+        Retrieve the information about these FYIs, given the keys of their original command messages.
 
-        keys_to_look_for = [channel_message_template.format(channel.id, x) for x in message_ids]
-        matching_fyis = []
-        for fyi_info in response["Items"]:
-            if fyi_info["config_channel_message"] in keys_to_look_for:
-                matching_fyis.append(self.get_fyi_helper(guild, fyi_info))
+        FYIs that no longer exist are omitted.
 
-        return matching_fyis
+        :param guild:
+        :param originals: a list of (chat channel ID, command message ID) pairs
+        :param projection: see get_fyi
+        :return:
+        """
+        keys = [
+            {"guild_id": guild.id, "config_channel_message": channel_message_template.format(*x)}
+            for x in set(originals)
+        ]
+        return [self.get_fyi_helper(guild, fyi_info) for fyi_info in self.batch_get_items(keys, projection)]
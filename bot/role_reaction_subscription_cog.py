@@ -283,6 +283,8 @@ class RoleReactionSubscriptionCog(Cog):
         if payload.user_id == self.bot.user.id:
             return
         guild = self.bot.get_guild(payload.guild_id)
+        if guild is None:
+            return
         subscription_info = self.db.get_subscription_info_by_message_id(guild, payload.message_id)
         # Do nothing if the guild doesn't have subscription for this role configured.
         if subscription_info is None:
@@ -332,3 +334,35 @@ class RoleReactionSubscriptionCog(Cog):
         :return:
         """
         await self.reaction_clicked(payload)
+
+    @Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        """
+        Drop the guild's resolved subscriptions, as the deleted role may have one.
+
+        :param role:
+        :return:
+        """
+        self.db.forget_resolved_subscriptions(role.guild)
+
+    @Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        """
+        Drop the guild's resolved subscriptions, as the deleted channel may hold a subscription message.
+
+        :param channel:
+        :return:
+        """
+        self.db.forget_resolved_subscriptions(channel.guild)
+
+    @Cog.listener()
+    async def on_guild_emojis_update(self, guild: discord.Guild, before, after):
+        """
+        Drop the guild's resolved subscriptions, as their emoji may have changed.
+
+        :param guild:
+        :param before:
+        :param after:
+        :return:
+        """
+        self.db.forget_resolved_subscriptions(guild)
@@ -17,11 +17,43 @@ from bot.convert_using_guild import emoji_converter, role_converter
 class RoleReactionSubscriptionDB(object):
     """
     A class representing the SQLite database we use to store our information.
+
+    The IDs of all subscription messages are loaded into memory when the database is opened (and kept current
+    by configure_role_reaction_subscription and remove_subscription_data), so that reactions on any other
+    message can be ignored without a query; each subscription is resolved the first time it's looked up by
+    message ID and cached until something invalidates it (e.g. the deletion of a role or emoji).
     """
     def __init__(self, path_to_db):
         self.path_to_db = path_to_db
         # The database can be initialized with role_reaction_subscription_initialization.sql
         self.conn = sqlite3.connect(self.path_to_db)
+        self.subscription_messages = {}  # maps subscription message ID (as a string) -|-> guild ID
+        self.resolved_subscriptions = {}  # maps subscription message ID (as a string) -|-> resolved subscription
+        self.load_subscription_messages()
+
+    def load_subscription_messages(self):
+        """
+        Read the IDs of all subscription messages into memory.
+
+        :return:
+        """
+        with self.conn:
+            message_cursor = self.conn.execute(
+                "select subscription_message_id, guild_id from role_reaction_subscription;"
+            )
+            self.subscription_messages = {str(message_id): guild_id for message_id, guild_id in message_cursor}
+        self.resolved_subscriptions = {}
+
+    def forget_resolved_subscriptions(self, guild: discord.Guild):
+        """
+        Drop this guild's resolved subscriptions so that they're resolved afresh next time.
+
+        :param guild:
+        :return:
+        """
+        for message_id, guild_id in self.subscription_messages.items():
+            if guild_id == guild.id:
+                self.resolved_subscriptions.pop(message_id, None)
 
     def convert_subscription_info_to_dict(self, guild: discord.Guild, subscription_info_tuple):
         """
@@ -101,10 +133,18 @@ class RoleReactionSubscriptionDB(object):
         """
         Return some raw guild information required for the role subscription when searching by message ID.
 
+        The result is shared between callers and must not be modified.
+
         :param guild:
         :param message_id:
         :return:
         """
+        message_id = str(message_id)
+        if self.subscription_messages.get(message_id) != guild.id:
+            return None
+        if message_id in self.resolved_subscriptions:
+            return self.resolved_subscriptions[message_id]
+
         with self.conn:
             guild_info_cursor = self.conn.execute(
                 """
@@ -118,10 +158,13 @@ class RoleReactionSubscriptionDB(object):
                 where guild_id = ?
                 and subscription_message_id = ?;
                 """,
-                (guild.id, str(message_id))
+                (guild.id, message_id)
             )
             guild_info_tuple = guild_info_cursor.fetchone()
-        return self.convert_subscription_info_to_dict(guild, guild_info_tuple)
+        result = self.convert_subscription_info_to_dict(guild, guild_info_tuple)
+        if result is not None:
+            self.resolved_subscriptions[message_id] = result
+        return result
 
     def get_guild_subscription_info(self, guild: discord.Guild):
         """
@@ -209,6 +252,8 @@ class RoleReactionSubscriptionDB(object):
                     role.id
                 )
             )
+        self.subscription_messages[str(subscription_message_id)] = guild.id
+        self.resolved_subscriptions.pop(str(subscription_message_id), None)
 
     def remove_subscription_data(self, guild: discord.Guild, role: discord.Role):
         """
@@ -219,7 +264,15 @@ class RoleReactionSubscriptionDB(object):
         :return:
         """
         with self.conn:
+            message_cursor = self.conn.execute(
+                "select subscription_message_id from role_reaction_subscription where guild_id = ? and role_id = ?;",
+                (guild.id, role.id)
+            )
+            message_ids = [str(message_tuple[0]) for message_tuple in message_cursor]
             self.conn.execute(
                 "delete from role_reaction_subscription where guild_id = ? and role_id = ?;",
                 (guild.id, role.id)
             )
+        for message_id in message_ids:
+            self.subscription_messages.pop(message_id, None)
+            self.resolved_subscriptions.pop(message_id, None)
@@ -1,3 +1,8 @@
+import io
+import json
+import tempfile
+import textwrap
+
 import discord
 
 
@@ -31,3 +36,52 @@ def break_up_long_message(message_text):
             curr_message += line
     chunks.append(curr_message)
     return chunks
+
+
+class JSONArrayFile(object):
+    """
+    Builds a JSON array file one element at a time, so that the elements need not all be held in memory.
+
+    The file is kept in memory until it grows past max_size bytes, and is then moved to a temporary file on disk.
+    (tempfile.SpooledTemporaryFile does the same, but before Python 3.11 it isn't an io.IOBase, which discord.File
+    requires of a file object.)  The result is formatted the same as json.dumps(elements, indent=4).
+    """
+    def __init__(self, max_size=1024 * 1024):
+        self.buffer = io.BytesIO()
+        self.max_size = max_size
+        self.count = 0
+
+    def write(self, data):
+        """
+        Write these bytes to the end of the file, moving it to disk if it has grown too large.
+
+        :param data:
+        :return:
+        """
+        self.buffer.write(data)
+        if isinstance(self.buffer, io.BytesIO) and self.buffer.tell() > self.max_size:
+            on_disk = tempfile.TemporaryFile()
+            on_disk.write(self.buffer.getbuffer())
+            self.buffer = on_disk
+
+    def append(self, element):
+        """
+        Serialize this element and add it to the end of the array.
+
+        :param element: a JSON-serializable object
+        :return:
+        """
+        self.write(b"[\n" if self.count == 0 else b",\n")
+        self.write(textwrap.indent(json.dumps(element, indent=4), "    ").encode("utf8"))
+        self.count += 1
+
+    def to_discord_file(self, filename):
+        """
+        Close the array and wrap it in a discord.File.
+
+        :param filename:
+        :return:
+        """
+        self.write(b"[]" if self.count == 0 else b"\n]")
+        self.buffer.seek(0)
+        return discord.File(self.buffer, filename=filename)
@@ -33,8 +33,8 @@ class VerificationCog(BotPermsChecker, Cog):
     denied = "👎"
 
     def __init__(self, bot, db, bot_permissions_db):
-        super(VerificationCog, self).__init__(bot, bot_permissions_db)  # a BotPermsDB or workalike
-        self.db = db  # a VerificationDB object or workalike
+        super(VerificationCog, self).__init__(bot, bot_permissions_db)  # an AsyncDB wrapping a BotPermsDB, or workalike
+        self.db = db  # an AsyncDB wrapping a VerificationDB, or workalike
         self.member_to_screenshot = {}  # maps member -|-> the member's most recent unverified screenshot
         self.screenshot_to_member = {}  # the converse mapping
 
@@ -54,9 +54,9 @@ class VerificationCog(BotPermsChecker, Cog):
         :param ctx:
         :return:
         """
-        self.can_configure_bot_validator(ctx)
+        await self.can_configure_bot_validator(ctx)
         try:
-            self.db.register_guild(ctx.guild)
+            await self.db.register_guild(ctx.guild)
             await ctx.message.channel.send(
                 f'{ctx.author.mention} This guild has been registered with {self.get_bot_member(ctx.guild).name} '
                 f'and may now be configured.'
@@ -67,23 +67,23 @@ class VerificationCog(BotPermsChecker, Cog):
                 f'{self.get_bot_member(ctx.guild).name}.'
             )
 
-    def is_guild_registered(self, guild):
+    async def is_guild_registered(self, guild):
         """
         Return True if guild is registered in the database; False otherwise.
 
         :param guild:
         :return:
         """
-        guild_info = self.db.get_verification_info(guild)
+        guild_info = await self.db.get_verification_info(guild)
         return guild_info is not None
 
-    def guild_registered_validator(self, guild):
+    async def guild_registered_validator(self, guild):
         """
         Raises a VerificationNotRegistered exception if the guild is not registered in the database.
         :param guild:
         :return:
         """
-        if not self.is_guild_registered(guild):
+        if not await self.is_guild_registered(guild):
             raise VerificationNotRegistered("The guild must first be registered with the bot.")
 
     @command()
@@ -95,8 +95,8 @@ class VerificationCog(BotPermsChecker, Cog):
         :param channel:
         :return:
         """
-        self.can_configure_bot_validator(ctx)
-        self.guild_registered_validator(ctx.guild)
+        await self.can_configure_bot_validator(ctx)
+        await self.guild_registered_validator(ctx.guild)
 
         # First, check that the client can write to this channel.
         channel_perms = channel.permissions_for(ctx.guild.get_member(self.bot.user.id))
@@ -106,7 +106,7 @@ class VerificationCog(BotPermsChecker, Cog):
             )
             return
 
-        self.db.set_channel(ctx.guild, channel, channel_type)  # this may raise BadArgument
+        await self.db.set_channel(ctx.guild, channel, channel_type)  # this may raise BadArgument
         await ctx.message.channel.send(f'{ctx.author.mention} {channel_type} channel set to {channel}.')
 
     @command()
@@ -119,10 +119,10 @@ class VerificationCog(BotPermsChecker, Cog):
         :param role:
         :return:
         """
-        self.can_configure_bot_validator(ctx)
-        self.guild_registered_validator(ctx.guild)
+        await self.can_configure_bot_validator(ctx)
+        await self.guild_registered_validator(ctx.guild)
 
-        self.db.set_welcome_role(ctx.guild, role)
+        await self.db.set_welcome_role(ctx.guild, role)
         await ctx.message.channel.send(f"{ctx.author.mention} This guild's welcome role has been set to: {role.id}")
 
     @command()
@@ -135,8 +135,8 @@ class VerificationCog(BotPermsChecker, Cog):
         :param emoji:
         :return:
         """
-        self.can_configure_bot_validator(ctx)
-        self.guild_registered_validator(ctx.guild)
+        await self.can_configure_bot_validator(ctx)
+        await self.guild_registered_validator(ctx.guild)
 
         emoji_converter = EmojiConverter()
         try:
@@ -144,7 +144,7 @@ class VerificationCog(BotPermsChecker, Cog):
         except BadArgument:
             actual_emoji = emoji
 
-        self.db.set_team_emoji(ctx.guild, team, actual_emoji)
+        await self.db.set_team_emoji(ctx.guild, team, actual_emoji)
         await ctx.message.channel.send(
             f'{ctx.author.mention} Guild information has been updated: {team.lower()} emoji is {emoji}.'
         )
@@ -159,10 +159,10 @@ class VerificationCog(BotPermsChecker, Cog):
         :param role:
         :return:
         """
-        self.can_configure_bot_validator(ctx)
-        self.guild_registered_validator(ctx.guild)
+        await self.can_configure_bot_validator(ctx)
+        await self.guild_registered_validator(ctx.guild)
 
-        self.db.set_team_role(ctx.guild, team, role)
+        await self.db.set_team_role(ctx.guild, team, role)
         await ctx.message.channel.send(
             f'{ctx.author.mention} Guild information has been updated: {team.lower()} role is {role.id}.'
         )
@@ -181,8 +181,8 @@ class VerificationCog(BotPermsChecker, Cog):
         :param welcome_message:
         :return:
         """
-        self.can_configure_bot_validator(ctx)
-        self.guild_registered_validator(ctx.guild)
+        await self.can_configure_bot_validator(ctx)
+        await self.guild_registered_validator(ctx.guild)
 
         # First, check that the client can write to this channel.
         channel_perms = welcome_channel.permissions_for(ctx.guild.get_member(self.bot.user.id))
@@ -192,7 +192,7 @@ class VerificationCog(BotPermsChecker, Cog):
             )
             return
 
-        self.db.set_welcome(ctx.guild, welcome_message, welcome_channel)
+        await self.db.set_welcome(ctx.guild, welcome_message, welcome_channel)
         await ctx.message.channel.send(
             f'{ctx.author.mention} New users will be welcomed in channel '
             f'{welcome_channel} with the message "{welcome_message}".'
@@ -212,16 +212,16 @@ class VerificationCog(BotPermsChecker, Cog):
         :param welcome_message:
         :return:
         """
-        self.can_configure_bot_validator(ctx)
-        self.guild_registered_validator(ctx.guild)
+        await self.can_configure_bot_validator(ctx)
+        await self.guild_registered_validator(ctx.guild)
 
-        self.db.set_denied_message(ctx.guild, denied_message)
+        await self.db.set_denied_message(ctx.guild, denied_message)
         await ctx.message.channel.send(
             f'{ctx.author.mention} Members whose verification was denied will be pinged '
             f'with the message "{denied_message}".'
         )
 
-    def guild_fully_configured(self, guild):
+    async def guild_fully_configured(self, guild):
         """
         Confirms that the guild in question is ready to go.
 
@@ -231,10 +231,10 @@ class VerificationCog(BotPermsChecker, Cog):
         :param ctx:
         :return:
         """
-        if not self.is_guild_registered(guild):
+        if not await self.is_guild_registered(guild):
             return False
 
-        guild_info = self.db.get_verification_info(guild)
+        guild_info = await self.db.get_verification_info(guild)
         if guild_info is None:
             raise RuntimeError("Guild information has been corrupted in the database")
 
@@ -243,14 +243,14 @@ class VerificationCog(BotPermsChecker, Cog):
             return False
         return True
 
-    def guild_fully_configured_validator(self, guild):
+    async def guild_fully_configured_validator(self, guild):
         """
         Raises a VerificationNotConfigured exception if the guild is not fully configured.
 
         :param guild:
         :return:
         """
-        if not self.guild_fully_configured(guild):
+        if not await self.guild_fully_configured(guild):
             raise VerificationNotConfigured("Basic guild configuration must be finished first.")
 
     @command()
@@ -262,11 +262,11 @@ class VerificationCog(BotPermsChecker, Cog):
         :param role:
         :return:
         """
-        self.can_configure_bot_validator(ctx)
-        self.guild_fully_configured_validator(ctx.guild)
+        await self.can_configure_bot_validator(ctx)
+        await self.guild_fully_configured_validator(ctx.guild)
         reply = f"{ctx.author.mention} Role {role} has been added to this guild's mandatory roles"
         try:
-            self.db.add_standard_role(ctx.guild, role, mandatory=True)
+            await self.db.add_standard_role(ctx.guild, role, mandatory=True)
         except ValueError:
             reply = f"{ctx.author.mention} Role {role} is already a mandatory role"
         await ctx.message.channel.send(reply)
@@ -280,11 +280,11 @@ class VerificationCog(BotPermsChecker, Cog):
         :param role:
         :return:
         """
-        self.can_configure_bot_validator(ctx)
-        self.guild_fully_configured_validator(ctx.guild)
+        await self.can_configure_bot_validator(ctx)
+        await self.guild_fully_configured_validator(ctx.guild)
         reply = f"{ctx.author.mention} Role {role} has been added to this guild's standard roles"
         try:
-            self.db.add_standard_role(ctx.guild, role, mandatory=False)
+            await self.db.add_standard_role(ctx.guild, role, mandatory=False)
         except ValueError:
             reply = f"{ctx.author.mention} Role {role} is already a standard role"
         await ctx.message.channel.send(reply)
@@ -299,10 +299,10 @@ class VerificationCog(BotPermsChecker, Cog):
         :param ctx:
         :return:
         """
-        self.can_configure_bot_validator(ctx)
-        self.guild_fully_configured_validator(ctx.guild)
+        await self.can_configure_bot_validator(ctx)
+        await self.guild_fully_configured_validator(ctx.guild)
 
-        self.db.clear_roles(ctx.guild)
+        await self.db.clear_roles(ctx.guild)
         await ctx.message.channel.send(
             f"{ctx.author.mention} All standard and mandatory roles given on verification have been cleared."
         )
@@ -341,10 +341,10 @@ class VerificationCog(BotPermsChecker, Cog):
         :param ctx:
         :return:
         """
-        self.can_configure_bot_validator(ctx)
-        self.guild_registered_validator(ctx.guild)
+        await self.can_configure_bot_validator(ctx)
+        await self.guild_registered_validator(ctx.guild)
 
-        guild_info = self.db.get_verification_info(ctx.guild)
+        guild_info = await self.db.get_verification_info(ctx.guild)
 
         role_list_strings = {}
         for role_type in ("standard", "mandatory"):
@@ -390,7 +390,7 @@ class VerificationCog(BotPermsChecker, Cog):
         :param new_member:
         :return:
         """
-        guild_info = self.db.get_verification_info(guild)
+        guild_info = await self.db.get_verification_info(guild)
         if guild_info is None:
             raise RuntimeError("Guild information has been corrupted in the database")
         welcome_channel = guild_info["welcome_channel"]
@@ -410,10 +410,10 @@ class VerificationCog(BotPermsChecker, Cog):
         :param roles_to_apply: a list of role names that should be applied
         :return:
         """
-        self.guild_fully_configured_validator(guild)
+        await self.guild_fully_configured_validator(guild)
 
         async with reply_channel.typing():
-            guild_info = self.db.get_verification_info(guild)
+            guild_info = await self.db.get_verification_info(guild)
             # if guild_info["welcome_role"] not in member.roles:
             #     await reply_channel.send(
             #         f"{verifier.mention} The specified member is not in the Welcome role."
@@ -538,9 +538,9 @@ class VerificationCog(BotPermsChecker, Cog):
         :param member: a Discord member
         :return:
         """
-        self.guild_fully_configured_validator(ctx.guild)
+        await self.guild_fully_configured_validator(ctx.guild)
 
-        guild_info = self.db.get_verification_info(ctx.guild)
+        guild_info = await self.db.get_verification_info(ctx.guild)
         await ctx.author.edit(
             roles=list(set(ctx.author.roles + guild_info["standard_roles"]))
         )
@@ -566,10 +566,10 @@ class VerificationCog(BotPermsChecker, Cog):
         :param member: a Discord member
         :return:
         """
-        self.guild_fully_configured_validator(ctx.guild)
+        await self.guild_fully_configured_validator(ctx.guild)
 
         async with ctx.message.channel.typing():
-            guild_info = self.db.get_verification_info(ctx.guild)
+            guild_info = await self.db.get_verification_info(ctx.guild)
             await member.edit(
                 roles=[guild_info["welcome_role"]],
                 nick=None,
@@ -579,14 +579,14 @@ class VerificationCog(BotPermsChecker, Cog):
                 f"{ctx.message.author.mention} Member {member} has been reset to the Welcome role."
             )
 
-    def is_welcome_member_screenshot(self, message):
+    async def is_welcome_member_screenshot(self, message):
         """
         True if this is a screenshot in the appropriate channel from a Welcome member, False otherwise.
 
         :param message:
         :return:
         """
-        guild_info = self.db.get_verification_info(message.guild)
+        guild_info = await self.db.get_verification_info(message.guild)
         if message.channel != guild_info["screenshot_channel"]:
             return False
         # if guild_info["welcome_role"] not in message.author.roles:
@@ -608,11 +608,11 @@ class VerificationCog(BotPermsChecker, Cog):
         :param screenshot_message:
         :return:
         """
-        self.guild_fully_configured_validator(screenshot_message.guild)
+        await self.guild_fully_configured_validator(screenshot_message.guild)
 
         # Having reached here, we know that this message is in the appropriate channel,
         # sent by someone with the Welcome role, and contains an attachment (presumably a screenshot).
-        verification_info = self.db.get_verification_info(screenshot_message.guild)
+        verification_info = await self.db.get_verification_info(screenshot_message.guild)
 
         await screenshot_message.clear_reactions()
         await screenshot_message.add_reaction(verification_info["instinct_emoji"])
@@ -641,10 +641,10 @@ class VerificationCog(BotPermsChecker, Cog):
             return
 
         # Do nothing if the guild isn't fully configured yet.
-        if not self.guild_fully_configured(message.guild):
+        if not await self.guild_fully_configured(message.guild):
             return
 
-        if self.is_welcome_member_screenshot(message):
+        if await self.is_welcome_member_screenshot(message):
             await self.welcome_member_screenshot_received(message)
 
     async def member_approved(self, member, team):
@@ -656,7 +656,7 @@ class VerificationCog(BotPermsChecker, Cog):
         :param member:
         :return:
         """
-        verification_info = self.db.get_verification_info(member.guild)
+        verification_info = await self.db.get_verification_info(member.guild)
 
         screenshot_message = self.member_to_screenshot.get(member, None)
         if screenshot_message is None:
@@ -678,7 +678,7 @@ class VerificationCog(BotPermsChecker, Cog):
         :param user:
         :return:
         """
-        guild_info = self.db.get_verification_info(reaction.message.guild)
+        guild_info = await self.db.get_verification_info(reaction.message.guild)
         # Do nothing if the guild isn't fully configured yet.
         if guild_info is None:
             return
@@ -735,5 +735,5 @@ class VerificationCog(BotPermsChecker, Cog):
             del self.member_to_screenshot[member]
             del self.screenshot_to_member[screenshot_message]
 
-        guild_info = self.db.get_verification_info(member.guild)
+        guild_info = await self.db.get_verification_info(member.guild)
         await guild_info["help_channel"].send(guild_info["denied_message"].format(member.mention))
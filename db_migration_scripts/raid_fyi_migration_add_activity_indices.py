@@ -0,0 +1,132 @@
+#! /usr/bin/env python
+
+import json
+import argparse
+import time
+import boto3
+from boto3.dynamodb.conditions import Attr
+
+
+ACTIVITY_INDICES = [
+    {
+        "IndexName": "ActiveFYIsByExpiry",
+        "KeySchema": [
+            {"AttributeName": "guild_id", "KeyType": "HASH"},
+            {"AttributeName": "active_expiry", "KeyType": "RANGE"},
+        ],
+        "Projection": {
+            "ProjectionType": "INCLUDE",
+            "NonKeyAttributes": ["relay_message_id", "chat_relay_message_id"],
+        },
+        "ProvisionedThroughput": {"ReadCapacityUnits": 5, "WriteCapacityUnits": 5},
+    },
+    {
+        "IndexName": "InactiveFYIsByExpiry",
+        "KeySchema": [
+            {"AttributeName": "guild_id", "KeyType": "HASH"},
+            {"AttributeName": "inactive_expiry", "KeyType": "RANGE"},
+        ],
+        "Projection": {"ProjectionType": "ALL"},
+        "ProvisionedThroughput": {"ReadCapacityUnits": 5, "WriteCapacityUnits": 5},
+    },
+]
+
+
+def get_original_fyis(table):
+    """
+    Retrieve the key, expiry, and active status of every original FYI in the specified RaidFYIDB table.
+    :param table:
+    :return:
+    """
+    scan_args = {
+        "ProjectionExpression": "guild_id, config_channel_message, expiry, active",
+        "FilterExpression": Attr("creator_id").exists(),
+    }
+    fyis = []
+    while True:
+        response = table.scan(**scan_args)
+        fyis.extend(response["Items"])
+        if "LastEvaluatedKey" not in response:
+            return fyis
+        scan_args["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def add_activity_marker(table, fyi_info):
+    """
+    Copy this FYI's expiry into "active_expiry" or "inactive_expiry", depending on whether it's active.
+    :param table:
+    :param fyi_info:
+    :return:
+    """
+    marker, other_marker = "active_expiry", "inactive_expiry"
+    if not fyi_info["active"]:
+        marker, other_marker = other_marker, marker
+
+    table.update_item(
+        Key={
+            "guild_id": fyi_info["guild_id"],
+            "config_channel_message": fyi_info["config_channel_message"]
+        },
+        UpdateExpression=f"SET {marker} = expiry REMOVE {other_marker}",
+    )
+
+
+def create_missing_indices(table):
+    """
+    Create whichever of the activity indices the table doesn't have yet, waiting for each to become active.
+    :param table:
+    :return:
+    """
+    client = table.meta.client
+    description = client.describe_table(TableName=table.name)["Table"]
+    existing = {x["IndexName"] for x in description.get("GlobalSecondaryIndexes", [])}
+    for index in ACTIVITY_INDICES:
+        if index["IndexName"] in existing:
+            continue
+        print(f"Creating index {index['IndexName']}")
+        # DynamoDB only allows one index to be created per update.
+        client.update_table(
+            TableName=table.name,
+            AttributeDefinitions=[
+                {"AttributeName": "guild_id", "AttributeType": "N"},
+                {"AttributeName": index["KeySchema"][1]["AttributeName"], "AttributeType": "S"},
+            ],
+            GlobalSecondaryIndexUpdates=[{"Create": index}],
+        )
+        while True:
+            time.sleep(5)
+            description = client.describe_table(TableName=table.name)["Table"]
+            statuses = {x["IndexName"]: x["IndexStatus"] for x in description.get("GlobalSecondaryIndexes", [])}
+            if statuses.get(index["IndexName"]) == "ACTIVE":
+                break
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        """Mark FYIs as active or inactive, and add the sparse indices that use these markers."""
+    )
+    parser.add_argument("--config", help="JSON file containing the required configuration",
+                        default="./gvrd_grunt_config.json")
+    args = parser.parse_args()
+
+    with open(args.config, "rb") as f:
+        settings = json.load(f)
+
+    db = boto3.resource(
+        "dynamodb",
+        endpoint_url=settings["endpoint_url"],
+        region_name=settings["region_name"],
+        aws_access_key_id=settings["aws_access_key_id"],
+        aws_secret_access_key=settings["aws_secret_access_key"]
+    )
+    table = db.Table(settings["fyi_table"])
+
+    for fyi_info in get_original_fyis(table):
+        print(f"Updating FYI {fyi_info['config_channel_message']} in guild {fyi_info['guild_id']} "
+              f"(active={fyi_info['active']})")
+        add_activity_marker(table, fyi_info)
+    create_missing_indices(table)
+
+
+if __name__ == "__main__":
+    main()
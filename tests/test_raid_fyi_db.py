@@ -0,0 +1,71 @@
+import copy
+import unittest
+from unittest import mock
+
+import discord
+
+from bot.convert_using_guild import invalidate_guild_index
+from bot.raid_fyi_db import RaidFYIDB
+
+
+class FakeTable(object):
+    """
+    Just enough of a DynamoDB Table to store and read a guild's FYI configuration.
+    """
+    def __init__(self):
+        self.items = {}  # maps (guild ID, config_channel_message) -|-> item
+
+    def put_item(self, Item):
+        self.items[(Item["guild_id"], Item["config_channel_message"])] = copy.deepcopy(Item)
+
+    def get_item(self, Key):
+        item = self.items.get((Key["guild_id"], Key["config_channel_message"]))
+        return {} if item is None else {"Item": copy.deepcopy(item)}
+
+    def query(self, **kwargs):
+        return {"Items": []}
+
+
+def make_emoji(emoji_id, name):
+    emoji = mock.MagicMock(spec=discord.Emoji)
+    emoji.id = emoji_id
+    emoji.name = name
+    return emoji
+
+
+class FYIConfigCacheTest(unittest.TestCase):
+    def setUp(self):
+        with mock.patch("bot.raid_fyi_db.boto3.resource"):
+            self.db = RaidFYIDB(config_cache_ttl=300)
+        self.db.table = FakeTable()
+        self.guild = mock.MagicMock(spec=discord.Guild)
+        self.guild.id = 1234
+        self.guild.roles = []
+        self.guild.emojis = []
+        invalidate_guild_index(self.guild)
+
+    def test_reconfigured_emoji_is_read_back(self):
+        self.db.configure_fyi(self.guild, "👍", "America/Vancouver")
+        self.assertEqual(self.db.get_fyi_info(self.guild)["fyi_emoji"], "👍")
+
+        self.db.configure_fyi(self.guild, "🎉", "America/Vancouver")
+        self.assertEqual(self.db.get_fyi_info(self.guild)["fyi_emoji"], "🎉")
+
+    def test_custom_emoji_is_resolved_afresh_after_invalidation(self):
+        old_emoji = make_emoji(55, "fyi")
+        self.guild.emojis = [old_emoji]
+        self.db.configure_fyi(self.guild, old_emoji, "America/Vancouver")
+        self.assertIs(self.db.get_fyi_info(self.guild)["fyi_emoji"], old_emoji)
+
+        # The guild's emoji change, as reported by on_guild_emojis_update.
+        new_emoji = make_emoji(55, "fyi_renamed")
+        self.guild.emojis = [new_emoji]
+        invalidate_guild_index(self.guild)
+        self.assertIs(self.db.get_fyi_info(self.guild)["fyi_emoji"], old_emoji)  # still cached
+
+        self.db.invalidate_fyi_info(self.guild)
+        self.assertIs(self.db.get_fyi_info(self.guild)["fyi_emoji"], new_emoji)
+
+
+if __name__ == "__main__":
+    unittest.main()
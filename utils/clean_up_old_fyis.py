@@ -108,6 +108,29 @@ def delete_fyi(
     :return:
     """
     channel_message_template = "channel{}#message{}"
+    edit_archive_template = "channel{}#message{}#edit{}"
+
+    # Find the FYI's archived edits by key prefix.
+    archived_edit_keys: List[str] = []
+    last_evaluated_key = None
+    while True:
+        query_args = {
+            "KeyConditionExpression": (
+                Key("guild_id").eq(fyi.guild_id) &
+                Key("config_channel_message").begins_with(
+                    edit_archive_template.format(fyi.chat_channel_id, fyi.command_message_id, "")
+                )
+            ),
+            "ProjectionExpression": "config_channel_message",
+        }
+        if last_evaluated_key is not None:
+            query_args["ExclusiveStartKey"] = last_evaluated_key
+        response = table.query(**query_args)
+        archived_edit_keys.extend(item["config_channel_message"] for item in response["Items"])
+        last_evaluated_key = response.get("LastEvaluatedKey")
+        if last_evaluated_key is None:
+            break
+
     with table.batch_writer() as batch:
         channels_and_messages: List[Tuple[int, int]] = [
             (fyi.chat_channel_id, fyi.command_message_id),
@@ -128,6 +151,14 @@ def delete_fyi(
                 }
             )
 
+        for config_channel_message in archived_edit_keys:
+            batch.delete_item(
+                Key={
+                    "guild_id": fyi.guild_id,
+                    "config_channel_message": config_channel_message,
+                }
+            )
+
 
 def main():
     parser = argparse.ArgumentParser(